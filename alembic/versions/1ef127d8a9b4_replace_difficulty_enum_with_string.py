@@ -17,11 +17,11 @@ depends_on = None
 
 
 def upgrade() -> None:
+    # Eine ALTER TABLE-Anweisung pro Tabelle: ein Lock und ein Rewrite statt mehrerer
     op.execute(
-        "ALTER TABLE scene ALTER COLUMN difficulty TYPE VARCHAR(16) USING difficulty::text"
-    )
-    op.execute(
-        "ALTER TABLE scene ALTER COLUMN table_variant TYPE VARCHAR(32) USING table_variant::text"
+        "ALTER TABLE scene"
+        " ALTER COLUMN difficulty TYPE VARCHAR(16) USING difficulty::text,"
+        " ALTER COLUMN table_variant TYPE VARCHAR(32) USING table_variant::text"
     )
 
     op.execute(
@@ -32,21 +32,15 @@ def upgrade() -> None:
     )
 
     op.execute(
-        "ALTER TABLE cue_parameters ALTER COLUMN effect_stage TYPE VARCHAR(32) USING effect_stage::text"
+        "ALTER TABLE cue_parameters"
+        " ALTER COLUMN effect_stage TYPE VARCHAR(32) USING effect_stage::text,"
+        " ALTER COLUMN effect_side TYPE VARCHAR(16) USING effect_side::text,"
+        " ALTER COLUMN effect_side SET DEFAULT 'none'"
     )
+
     op.execute(
-        "ALTER TABLE cue_parameters ALTER COLUMN effect_side TYPE VARCHAR(16) USING effect_side::text"
+        sa.text("DROP TYPE IF EXISTS difficulty, tablevariant, ballname, effectstage, effectside")
     )
-    op.execute("ALTER TABLE cue_parameters ALTER COLUMN effect_side SET DEFAULT 'none'")
-
-    for enum_name in [
-        "difficulty",
-        "tablevariant",
-        "ballname",
-        "effectstage",
-        "effectside",
-    ]:
-        op.execute(sa.text(f"DROP TYPE IF EXISTS {enum_name}"))
 
 
 def downgrade() -> None:
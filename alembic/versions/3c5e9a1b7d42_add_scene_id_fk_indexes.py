@@ -0,0 +1,48 @@
+"""add scene_id indexes on child tables
+
+Revision ID: 3c5e9a1b7d42
+Revises: 1ef127d8a9b4
+Create Date: 2026-10-15 09:12:31.418205
+"""
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision = "3c5e9a1b7d42"
+down_revision = "1ef127d8a9b4"
+branch_labels = None
+depends_on = None
+
+
+# ball_position, cue_parameters und tempo_force sind bereits über ihre
+# Unique-Constraints (scene_id als führende Spalte) indiziert,
+# trajectory_segment über ix_trajectory_scene_sequence.
+SCENE_ID_INDEXES = {
+    "ix_scene_note_scene_id": "scene_note",
+    "ix_scene_source_asset_scene_id": "scene_source_asset",
+}
+
+
+def upgrade() -> None:
+    # CONCURRENTLY ist in einer Transaktion nicht erlaubt
+    with op.get_context().autocommit_block():
+        for index_name, table_name in SCENE_ID_INDEXES.items():
+            op.create_index(
+                index_name,
+                table_name,
+                ["scene_id"],
+                postgresql_concurrently=True,
+                if_not_exists=True,
+            )
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        for index_name, table_name in SCENE_ID_INDEXES.items():
+            op.drop_index(
+                index_name,
+                table_name=table_name,
+                postgresql_concurrently=True,
+                if_exists=True,
+            )
@@ -0,0 +1,38 @@
+"""add partial index for trajectory events
+
+Revision ID: 5a7c3e91f0b8
+Revises: 8d2f6b0e4a17
+Create Date: 2026-10-15 10:41:07.305662
+"""
+
+import sqlalchemy as sa
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision = "5a7c3e91f0b8"
+down_revision = "8d2f6b0e4a17"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.create_index(
+            "ix_trajectory_scene_event",
+            "trajectory_segment",
+            ["scene_id", "event_kind"],
+            postgresql_where=sa.text("event_kind IS NOT NULL"),
+            postgresql_concurrently=True,
+            if_not_exists=True,
+        )
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.drop_index(
+            "ix_trajectory_scene_event",
+            table_name="trajectory_segment",
+            postgresql_concurrently=True,
+            if_exists=True,
+        )
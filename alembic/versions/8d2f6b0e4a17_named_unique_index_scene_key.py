@@ -0,0 +1,34 @@
+"""replace scene_key unique constraint with named unique index
+
+Revision ID: 8d2f6b0e4a17
+Revises: 3c5e9a1b7d42
+Create Date: 2026-10-15 10:03:52.771940
+"""
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision = "8d2f6b0e4a17"
+down_revision = "3c5e9a1b7d42"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # Neuer Index zuerst, damit scene_key durchgehend eindeutig abgesichert bleibt
+    with op.get_context().autocommit_block():
+        op.create_index(
+            "ix_scene_scene_key",
+            "scene",
+            ["scene_key"],
+            unique=True,
+            postgresql_concurrently=True,
+            if_not_exists=True,
+        )
+    op.execute("ALTER TABLE scene DROP CONSTRAINT IF EXISTS scene_scene_key_key")
+
+
+def downgrade() -> None:
+    op.create_unique_constraint("scene_scene_key_key", "scene", ["scene_key"])
+    op.drop_index("ix_scene_scene_key", table_name="scene")
@@ -0,0 +1,46 @@
+"""add ball_name indexes for cross-scene ball queries
+
+Revision ID: b64e0d2c9f35
+Revises: 5a7c3e91f0b8
+Create Date: 2026-10-15 11:26:44.092517
+"""
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision = "b64e0d2c9f35"
+down_revision = "5a7c3e91f0b8"
+branch_labels = None
+depends_on = None
+
+
+# Szenenbezogene Abfragen sind bereits über uq_ball_position_scene_ball bzw.
+# ix_trajectory_scene_sequence abgedeckt; diese Indizes führen mit ball_name
+BALL_NAME_INDEXES = {
+    "ix_trajectory_ball_scene": ("trajectory_segment", ["ball_name", "scene_id", "sequence_index"]),
+    "ix_ball_position_ball": ("ball_position", ["ball_name", "scene_id"]),
+}
+
+
+def upgrade() -> None:
+    with op.get_context().autocommit_block():
+        for index_name, (table_name, columns) in BALL_NAME_INDEXES.items():
+            op.create_index(
+                index_name,
+                table_name,
+                columns,
+                postgresql_concurrently=True,
+                if_not_exists=True,
+            )
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        for index_name, (table_name, _) in BALL_NAME_INDEXES.items():
+            op.drop_index(
+                index_name,
+                table_name=table_name,
+                postgresql_concurrently=True,
+                if_exists=True,
+            )
@@ -0,0 +1,32 @@
+#!/usr/bin/env python3
+"""Rendert die Ziffern-Templates für die Ballverfeinerung vorab.
+
+Schreibt die Templates der Ziffern 0-9 nach src/tools/digit_templates.npz
+(nur die normale Variante, die invertierte deckt das Matching über das
+negierte Ergebnis ab). capture_scene lädt diese Datei beim ersten
+Template-Zugriff und rendert nur noch, falls sie fehlt.
+
+Aufruf (nach ``source scripts/env.sh``):
+    python scripts/build_digit_templates.py
+"""
+
+import numpy as np
+
+from src.tools.capture_scene import (
+    DIGIT_TEMPLATE_FILE,
+    _digit_template_name,
+    _render_digit_template,
+)
+
+
+def main():
+    templates = {
+        _digit_template_name(digit): _render_digit_template(digit, False)
+        for digit in range(10)
+    }
+    np.savez_compressed(DIGIT_TEMPLATE_FILE, **templates)
+    print(f"{len(templates)} Templates geschrieben: {DIGIT_TEMPLATE_FILE}")
+
+
+if __name__ == "__main__":
+    main()
@@ -6,8 +6,15 @@
 - Ab Seite 255: 2 Szenen pro Seite
 """
 
+import argparse
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+import copy
+import json
 from pathlib import Path
+import os
+import shutil
 import sys
+import tempfile
 
 try:
     import fitz  # PyMuPDF
@@ -17,6 +24,12 @@ except ImportError:
 
 import yaml
 
+# libyaml-Bindings verwenden, falls verfügbar (deutlich schneller als reines Python)
+try:
+    from yaml import CSafeDumper as _SafeDumper
+except ImportError:  # pragma: no cover
+    from yaml import SafeDumper as _SafeDumper
+
 # Pfade
 PDF_PATH = Path("49210831040 Gernot Ullrich.pdf")
 OUTPUT_IMAGE_DIR = Path("data/raw/gretillat")
@@ -27,30 +40,143 @@ OUTPUT_IMAGE_DIR.mkdir(parents=True, exist_ok=True)
 OUTPUT_YAML_DIR.mkdir(parents=True, exist_ok=True)
 
 
-def extract_images(pdf_path: Path, start_page: int, end_page: int) -> None:
-    """Extrahiert Seiten aus PDF als PNG-Images."""
+# Pro Worker-Prozess geöffnetes PDF (PyMuPDF-Dokumente sind nicht thread-safe)
+_worker_doc = None
+
+
+class _SceneDumper(_SafeDumper):
+    """YAML-Dumper ohne Anker/Aliase – die Szenen-Dicts teilen keine Objekte."""
+
+    def ignore_aliases(self, data) -> bool:
+        return True
+
+
+def _init_render_worker(pdf_path: Path) -> None:
+    """Öffnet das PDF einmal pro Worker-Prozess."""
+    global _worker_doc
+    _worker_doc = fitz.open(pdf_path)
+
+
+def _image_path(page_num: int) -> Path:
+    """Ausgabepfad width_gather-nnn.png für eine Seite (0-indexed)."""
+    return OUTPUT_IMAGE_DIR / f"width_gather-{page_num + 1}.png"
+
+
+def _render_page(page_num: int) -> Path:
+    """Rendert eine Seite (0-indexed) als PNG und gibt den Ausgabepfad zurück."""
+    page = _worker_doc[page_num]
+    # Render mit hoher Auflösung
+    pix = page.get_pixmap(matrix=fitz.Matrix(2, 2))  # 2x Zoom für bessere Qualität
+
+    output_path = _image_path(page_num)
+    # PNG bleibt (Ingest/Visualisierung erwarten .png), aber mit schneller
+    # zlib-Stufe statt der Standardkompression
+    pix.pil_save(output_path, optimize=False, compress_level=1)
+    return output_path
+
+
+def extract_images(pdf_path: Path, start_page: int, end_page: int, force: bool = False) -> None:
+    """Extrahiert Seiten aus PDF als PNG-Images.
+
+    Die Seiten sind unabhängig voneinander und werden parallel in
+    Worker-Prozessen gerendert (je ein geöffnetes PDF pro Prozess).
+    Bereits vorhandene PNGs, die neuer als das PDF sind, werden ohne
+    ``force`` übersprungen.
+    """
     if not pdf_path.exists():
         raise FileNotFoundError(f"PDF nicht gefunden: {pdf_path}")
     
-    doc = fitz.open(pdf_path)
+    with fitz.open(pdf_path) as doc:
+        page_count = len(doc)
+    pdf_mtime = pdf_path.stat().st_mtime
     print(f"Extrahiere Seiten {start_page}-{end_page} aus PDF...")
     
+    page_nums = []
     for page_num in range(start_page - 1, end_page):  # 0-indexed
-        if page_num >= len(doc):
+        if page_num >= page_count:
             print(f"  ⚠ Seite {page_num + 1} existiert nicht im PDF")
             continue
-        
-        page = doc[page_num]
-        # Render mit hoher Auflösung
-        pix = page.get_pixmap(matrix=fitz.Matrix(2, 2))  # 2x Zoom für bessere Qualität
-        
-        # Speichere als width_gather-nnn.png
-        output_path = OUTPUT_IMAGE_DIR / f"width_gather-{page_num + 1}.png"
-        pix.save(output_path)
-        print(f"  ✓ Seite {page_num + 1} → {output_path.name}")
+        output_path = _image_path(page_num)
+        if not force and output_path.exists() and output_path.stat().st_mtime >= pdf_mtime:
+            print(f"  ↻ {output_path.name} vorhanden, überspringe")
+            continue
+        page_nums.append(page_num)
+    
+    if not page_nums:
+        print("✓ Alle Seiten bereits extrahiert\n")
+        return
     
-    doc.close()
-    print(f"✓ {end_page - start_page + 1} Seiten extrahiert\n")
+    with ProcessPoolExecutor(
+        max_workers=os.cpu_count(),
+        initializer=_init_render_worker,
+        initargs=(pdf_path,),
+    ) as executor:
+        for page_num, output_path in zip(page_nums, executor.map(_render_page, page_nums)):
+            print(f"  ✓ Seite {page_num + 1} → {output_path.name}")
+    
+    print(f"✓ {len(page_nums)} Seiten extrahiert\n")
+
+
+# Vorlage für Viertelbillard-Szenen; einmalig aufgebaut, je Szene kopiert
+_SCENE_TEMPLATE = {
+    "scene": {
+        "id": None,  # je Szene gesetzt
+        "title": None,  # je Szene gesetzt
+        "source": {
+            "work": "Gretillat - L'apprentissage du billard français",
+            "section": "Width Gather Shots",
+            "page": None,  # je Szene gesetzt
+        },
+        "difficulty": "easy",
+        "description": "TODO: Szene beschreiben.",
+        "table": {
+            "type": "carom_standard",
+            "size_units": [40.0, 80.0],
+            "unit": "diamonds",
+            "origin": "bottom_left",
+            "grid_resolution": 0.5,
+            "physical_size_cm": [284.0, 142.0],
+            "variant": "match",
+        },
+        "balls": {
+            "B1": {"color": "white", "position": [0.0, 0.0]},
+            "B2": {"color": "yellow", "position": [0.0, 0.0]},
+            "B3": {"color": "red", "position": [0.0, 0.0]},
+        },
+        "ghost_ball": {
+            "position": [0.0, 0.0],
+            "notes": "Virtuelle Position des Spielballs bei Kontakt mit B2",
+        },
+        "ball_contact": {
+            "fraction": 0.0,
+            "label": "pending",
+        },
+        "cue": {
+            "cue_direction": [0.0, 0.0],
+            "attack_height": "pending",
+            "effect_stage": "stage_0",
+            "effect_side": "none",
+            "cue_inclination_deg": 0.0,
+            "notes": ["TODO – ergänzen"],
+        },
+        "tempo_force": {
+            "tempo": 0,
+            "force": 0,
+            "comments": "pending",
+        },
+        "trajectory": {
+            "B1": [],
+            "B2": [],
+            "B3": [],
+        },
+        "text": {
+            "original_language": "fr",
+            "original_excerpt": "TODO – ergänzen",
+            "de_summary": "TODO – übersetzen",
+        },
+        "remarks": ["TODO – ergänzen"],
+    }
+}
 
 
 def create_yaml_template(scene_id: str, page: int | str, scene_index: int) -> dict:
@@ -61,115 +187,110 @@ def create_yaml_template(scene_id: str, page: int | str, scene_index: int) -> di
         page: Seitenzahl als Integer oder String mit Position (z.B. 270 oder "270 oben")
         scene_index: Index der Szene (1-basiert)
     """
-    return {
-        "scene": {
-            "id": scene_id,
-            "title": f"Width Gather Shot – Szene {scene_index:02d}",
-            "source": {
-                "work": "Gretillat - L'apprentissage du billard français",
-                "section": "Width Gather Shots",
-                "page": page,
-            },
-            "difficulty": "easy",
-            "description": "TODO: Szene beschreiben.",
-            "table": {
-                "type": "carom_standard",
-                "size_units": [40.0, 80.0],
-                "unit": "diamonds",
-                "origin": "bottom_left",
-                "grid_resolution": 0.5,
-                "physical_size_cm": [284.0, 142.0],
-                "variant": "match",
-            },
-            "balls": {
-                "B1": {"color": "white", "position": [0.0, 0.0]},
-                "B2": {"color": "yellow", "position": [0.0, 0.0]},
-                "B3": {"color": "red", "position": [0.0, 0.0]},
-            },
-            "ghost_ball": {
-                "position": [0.0, 0.0],
-                "notes": "Virtuelle Position des Spielballs bei Kontakt mit B2",
-            },
-            "ball_contact": {
-                "fraction": 0.0,
-                "label": "pending",
-            },
-            "cue": {
-                "cue_direction": [0.0, 0.0],
-                "attack_height": "pending",
-                "effect_stage": "stage_0",
-                "effect_side": "none",
-                "cue_inclination_deg": 0.0,
-                "notes": ["TODO – ergänzen"],
-            },
-            "tempo_force": {
-                "tempo": 0,
-                "force": 0,
-                "comments": "pending",
-            },
-            "trajectory": {
-                "B1": [],
-                "B2": [],
-                "B3": [],
-            },
-            "text": {
-                "original_language": "fr",
-                "original_excerpt": "TODO – ergänzen",
-                "de_summary": "TODO – übersetzen",
-            },
-            "remarks": ["TODO – ergänzen"],
-        }
-    }
+    data = copy.deepcopy(_SCENE_TEMPLATE)
+    scene = data["scene"]
+    scene["id"] = scene_id
+    scene["title"] = f"Width Gather Shot – Szene {scene_index:02d}"
+    scene["source"]["page"] = page
+    return data
 
 
-def create_yaml_files() -> None:
-    """Erstellt YAML-Dateien für alle Viertelbillard-Szenen."""
-    print("Erstelle YAML-Dateien...")
-    
-    # Ab Seite 255: 2 Szenen pro Seite bis Seite 271
-    # VS-width-02-01 bis VS-width-02-33 (33 Szenen)
-    scene_num = 1
-    
-    # Seite 255-270: je 2 Szenen (oben/unten)
-    for page in range(255, 271):
-        for scene_in_page, position in enumerate(["oben", "unten"], 1):
-            scene_id = f"VS-width-02-{scene_num:02d}"
-            page_with_position = f"{page} {position}"
-            yaml_data = create_yaml_template(scene_id, page_with_position, scene_num)
-            
-            output_path = OUTPUT_YAML_DIR / f"{scene_id}.yaml"
-            with output_path.open("w", encoding="utf-8") as fh:
-                yaml.safe_dump(yaml_data, fh, allow_unicode=True, sort_keys=False, default_flow_style=False)
-            
-            print(f"  ✓ {scene_id}.yaml (Seite {page_with_position})")
-            scene_num += 1
+def _scene_jobs() -> list[tuple[str, str, int]]:
+    """Liste (scene_id, Seite mit Position, Szenen-Nr.) aller Viertelbillard-Szenen.
+
+    Ab Seite 255 je 2 Szenen (oben/unten); VS-width-02-33 ist Seite 271 oben.
+    """
+    pages = [(page, position) for page in range(255, 272) for position in ("oben", "unten")]
+    return [
+        (f"VS-width-02-{scene_num:02d}", f"{page} {position}", scene_num)
+        for scene_num, (page, position) in enumerate(pages[:33], start=1)
+    ]
+
+
+def _create_scene_yaml(job: tuple[str, str, int], force: bool, staging_dir: Path, as_json: bool) -> bool:
+    """Baut die Vorlage für einen Job aus _scene_jobs() und schreibt sie nach ``staging_dir``.
+
+    Vorhandene (evtl. bearbeitete) Szenendateien werden nur mit ``force`` ersetzt.
+    """
+    scene_id, page_with_position, scene_num = job
+    file_name = f"{scene_id}.json" if as_json else f"{scene_id}.yaml"
+    if (OUTPUT_YAML_DIR / file_name).exists() and not force:
+        return False
+    yaml_data = create_yaml_template(scene_id, page_with_position, scene_num)
+    with (staging_dir / file_name).open("w", encoding="utf-8") as fh:
+        if as_json:
+            json.dump(yaml_data, fh, ensure_ascii=False, indent=2)
+        else:
+            yaml.dump(yaml_data, fh, Dumper=_SceneDumper, allow_unicode=True, sort_keys=False, default_flow_style=False)
+    return True
+
+
+def create_yaml_files(force: bool = False, as_json: bool = False) -> None:
+    """Erstellt YAML-Dateien für alle Viertelbillard-Szenen.
+
+    Die Dateien sind unabhängig voneinander und werden von einem kleinen
+    Thread-Pool in ein Staging-Verzeichnis geschrieben; die Ausgabe erfolgt
+    in Szenen-Reihenfolge. Anschließend werden sie per atomarem Rename
+    veröffentlicht und das Zielverzeichnis einmal gesynct.
+    Mit ``as_json`` entstehen JSON- statt YAML-Dateien (für rein maschinelle
+    Weiterverarbeitung; ``load_scene_yaml`` liest beide Formate).
+    """
+    suffix = ".json" if as_json else ".yaml"
+    print(f"Erstelle {suffix[1:].upper()}-Dateien...")
     
-    # Seite 271: letzte Szene (VS-width-02-33)
-    if scene_num <= 33:
-        scene_id = f"VS-width-02-{scene_num:02d}"
-        yaml_data = create_yaml_template(scene_id, "271 oben", scene_num)
+    jobs = _scene_jobs()
+    # Eigenes Staging-Verzeichnis je Lauf (im Zielverzeichnis, damit os.replace atomar bleibt);
+    # Reste eines abgebrochenen Laufs stören so nicht und werden im finally entfernt
+    staging_dir = Path(tempfile.mkdtemp(prefix=".tmp-", dir=OUTPUT_YAML_DIR))
+    try:
+        written_names = []
+        with ThreadPoolExecutor(max_workers=8) as executor:
+            written = executor.map(lambda job: _create_scene_yaml(job, force, staging_dir, as_json), jobs)
+            for (scene_id, page_with_position, _), was_written in zip(jobs, written):
+                if was_written:
+                    written_names.append(f"{scene_id}{suffix}")
+                    print(f"  ✓ {scene_id}{suffix} (Seite {page_with_position})")
+                else:
+                    print(f"  ↻ {scene_id}{suffix} vorhanden, überspringe")
         
-        output_path = OUTPUT_YAML_DIR / f"{scene_id}.yaml"
-        with output_path.open("w", encoding="utf-8") as fh:
-            yaml.safe_dump(yaml_data, fh, allow_unicode=True, sort_keys=False, default_flow_style=False)
-        
-        print(f"  ✓ {scene_id}.yaml (Seite 271 oben, letzte Szene)")
+        for file_name in written_names:
+            os.replace(staging_dir / file_name, OUTPUT_YAML_DIR / file_name)
+    finally:
+        shutil.rmtree(staging_dir, ignore_errors=True)
+    dir_fd = os.open(OUTPUT_YAML_DIR, os.O_RDONLY)
+    try:
+        os.fsync(dir_fd)
+    finally:
+        os.close(dir_fd)
     
-    print(f"\n✓ {scene_num} YAML-Dateien erstellt")
+    print(f"\n✓ {len(jobs)} {suffix[1:].upper()}-Dateien verarbeitet")
 
 
 def main():
     """Hauptfunktion."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument(
+        "--force",
+        action="store_true",
+        help="Vorhandene PNGs und YAML-Dateien neu erzeugen bzw. überschreiben",
+    )
+    parser.add_argument(
+        "--json",
+        action="store_true",
+        help="Szenen als JSON statt YAML schreiben (nur für maschinelle Weiterverarbeitung)",
+    )
+    args = parser.parse_args()
+    
     print("=" * 60)
     print("Extraktion der Viertelbillard-Szenen (Width Gather Shots)")
     print("=" * 60)
     print()
     
     # 1. Extrahiere Images (Seiten 252-271)
-    extract_images(PDF_PATH, 252, 271)
+    extract_images(PDF_PATH, 252, 271, force=args.force)
     
     # 2. Erstelle YAML-Dateien
-    create_yaml_files()
+    create_yaml_files(force=args.force, as_json=args.json)
     
     print()
     print("=" * 60)
@@ -11,75 +11,134 @@ from pathlib import Path
 import re
 import yaml
 
+# libyaml-Bindings verwenden, falls verfügbar (deutlich schneller als reines Python)
+try:
+    from yaml import CSafeDumper as _SafeDumper, CSafeLoader as _SafeLoader
+except ImportError:  # pragma: no cover
+    from yaml import SafeDumper as _SafeDumper, SafeLoader as _SafeLoader
+
 try:
     import pdfplumber
+    HAS_PDFPLUMBER = True
 except ImportError:
-    print("Fehler: pdfplumber nicht installiert. Bitte installieren: pip install pdfplumber")
-    exit(1)
+    HAS_PDFPLUMBER = False
 
 PDF_PATH = Path("49210831040 Gernot Ullrich.pdf")
 YAML_DIR = Path("data/annotations/gretillat")
 
+# Titel (z.B. "2.1. DIRECT POINT - GATHER SHOT BY ONE BAND")
+# Titel endet vor "Quantité de bille" oder vor dem nächsten Absatz
+_TITLE_RE = re.compile(r'(\d+\.\d+\.?\s+[A-Z][^Q]+?)(?=\s*Quantité|\n\n|$)', re.DOTALL)
+# Leerraum zusammenfassen und Bindestriche normalisieren in einem Durchlauf
+# (Gruppe "double": Bindestrich, auf den direkt ein weiterer folgt)
+_TITLE_SPACING_RE = re.compile(r'(?P<double>\s*-(?=\s*-))|\s*-\s*|\s+')
+# OCR-Artefakte: isolierte Zahlen, einzelne Buchstaben, Ziffernfolge am Ende (z.B. "4 9 2 1 0 8 3 1")
+_TITLE_ARTIFACT_RE = re.compile(r'\s+(?:\d+|[a-z])(?=\s)|\s+\d(?:\s+\d)*$', re.IGNORECASE)
+
+# Cue-Parameter
+_QTY_RE = re.compile(r'Quantité de bille:\s*([^\n]+)', re.IGNORECASE)
+# Hauteur d'attaque (unterstützt verschiedene Apostrophe)
+_HEIGHT_RE = re.compile(r"Hauteur\s+d.atta?que:\s*([^\n]+)", re.IGNORECASE | re.MULTILINE)
+_EFFET_RE = re.compile(r'Effet:\s*([^\n]+)', re.IGNORECASE)
+_ENERGIE_RE = re.compile(r'Energie:\s*([^\n]+)', re.IGNORECASE)
+
+# Englischer Text (beginnt mit Großbuchstaben, Zeilenumbrüche zwischen Wörtern erlaubt);
+# eine Alternation, damit ein Durchlauf den frühesten Textanfang findet
+_TEXT_RE = re.compile(
+    r'(If\s+ball\s+\d+\s+[^0-9]+?|If\s+[^0-9]+?|No\s+[^0-9]+?|This\s+[^0-9]+?'
+    r'|Ball\s+\d+\s+[^0-9]+?|The\s+[^0-9]+?)(?=\d+\.\d+\.|$)',
+    re.IGNORECASE | re.DOTALL,
+)
+# Leerraum zusammenfassen, einzelner Buchstabe am Ende (OCR-Artefakt) entfällt
+_EXCERPT_SPACING_RE = re.compile(r'(\s+[a-z]$)|\s+')
+
+
+class _SceneDumper(_SafeDumper):
+    """YAML-Dumper ohne Anker/Aliase – die Szenen-Dicts teilen keine Objekte."""
+
+    def ignore_aliases(self, data) -> bool:
+        return True
+
+
+def _title_spacing(match: re.Match) -> str:
+    if match.group('double') is not None:
+        return ' –'  # direkt folgender Bindestrich liefert das nächste Leerzeichen
+    return ' – ' if '-' in match.group() else ' '
 
-def extract_scene_info(text: str, position: str) -> dict:
-    """Extrahiert Informationen für eine Szene aus dem Text.
+
+def _excerpt_spacing(match: re.Match) -> str:
+    return '' if match.group(1) else ' '
+
+
+def extract_page_text(page) -> str | None:
+    """Extrahiert den Text einer Seite und gibt danach ihren Objekt-Cache frei.
+
+    pdfplumber hält die geparsten Zeichen/Linien jeder besuchten Seite im Speicher;
+    ohne flush_cache() wächst der Verbrauch mit jeder Seite.
+    """
+    try:
+        # Einfacher Zeilenmodus (ohne Layout-Rekonstruktion) mit groben Toleranzen;
+        # für die Regex-Auswertung genügt zeilenweise geordneter Text
+        return page.extract_text_simple(x_tolerance=3, y_tolerance=3)
+    finally:
+        page.flush_cache()
+
+
+def split_halves(text: str) -> tuple[str, str]:
+    """Teilt den Seitentext einmalig in obere und untere Hälfte (Szene oben/unten)."""
+    lines = text.split('\n')
+    mid_point = len(lines) // 2
+    return '\n'.join(lines[:mid_point]), '\n'.join(lines[mid_point:])
+
+
+def extract_scene_info(scene_text: str) -> dict:
+    """Extrahiert Informationen für eine Szene aus ihrer Seitenhälfte.
     
     Args:
-        text: Volltext der Seite
-        position: "oben" oder "unten"
+        scene_text: Text der Seitenhälfte (siehe split_halves)
     
     Returns:
         Dict mit title, cue_notes, original_excerpt
     """
-    # Teile Text in obere und untere Hälfte
-    lines = text.split('\n')
-    mid_point = len(lines) // 2
-    
-    if position == "oben":
-        scene_text = '\n'.join(lines[:mid_point])
-    else:
-        scene_text = '\n'.join(lines[mid_point:])
-    
-    # Extrahiere Titel (z.B. "2.1. DIRECT POINT - GATHER SHOT BY ONE BAND")
-    # Titel endet vor "Quantité de bille" oder vor dem nächsten Absatz
-    title_match = re.search(r'(\d+\.\d+\.?\s+[A-Z][^Q]+?)(?=\s*Quantité|\n\n|$)', scene_text, re.DOTALL)
+    # Extrahiere Titel
+    title_match = _TITLE_RE.search(scene_text)
     if title_match:
         title = title_match.group(1).strip()
-        # Bereinige Titel (entferne Zeilenumbrüche, extra Leerzeichen)
-        title = re.sub(r'\s+', ' ', title)
-        title = re.sub(r'\s*-\s*', ' – ', title)  # Normalisiere Bindestriche
-        # Entferne OCR-Artefakte (isolierte Zahlen, einzelne Buchstaben)
-        title = re.sub(r'\s+\d+\s+', ' ', title)  # Entferne isolierte Zahlen
-        title = re.sub(r'\s+[a-z]\s+', ' ', title, flags=re.IGNORECASE)  # Entferne einzelne Buchstaben
-        title = re.sub(r'\s+', ' ', title)  # Nochmal extra Leerzeichen entfernen
-        # Entferne Zahlen am Ende (z.B. "4 9 2 1 0 8 3 1")
-        title = re.sub(r'\s+\d(\s+\d)*\s*$', '', title)
+        # Bereinige Titel (entferne Zeilenumbrüche, extra Leerzeichen, normalisiere Bindestriche)
+        title = _TITLE_SPACING_RE.sub(_title_spacing, title)
+        # Entferne OCR-Artefakte (isolierte Zahlen, einzelne Buchstaben, Zahlen am Ende)
+        title = _TITLE_ARTIFACT_RE.sub('', title)
     else:
         title = None
     
-    # Extrahiere Cue-Parameter
+    # Extrahiere Cue-Parameter (Regex nur, wenn das jeweilige Label überhaupt vorkommt)
     cue_notes = []
+    lowered = scene_text.lower()
     
     # Quantité de bille
-    qty_match = re.search(r'Quantité de bille:\s*([^\n]+)', scene_text, re.IGNORECASE)
-    if qty_match:
-        cue_notes.append(f"Quantité de bille: {qty_match.group(1).strip()}")
+    if "quantité de bille:" in lowered:
+        qty_match = _QTY_RE.search(scene_text)
+        if qty_match:
+            cue_notes.append(f"Quantité de bille: {qty_match.group(1).strip()}")
     
     # Hauteur d'attaque (kann über mehrere Zeilen gehen, unterstützt verschiedene Apostrophe)
     # Unterstützt: gerader Apostroph ('), typografischer Apostroph ('), und andere Varianten
-    height_match = re.search(r"Hauteur\s+d.atta?que:\s*([^\n]+)", scene_text, re.IGNORECASE | re.MULTILINE)
-    if height_match:
-        cue_notes.append(f"Hauteur d'attaque: {height_match.group(1).strip()}")
+    if "hauteur" in lowered:
+        height_match = _HEIGHT_RE.search(scene_text)
+        if height_match:
+            cue_notes.append(f"Hauteur d'attaque: {height_match.group(1).strip()}")
     
     # Effet
-    effet_match = re.search(r'Effet:\s*([^\n]+)', scene_text, re.IGNORECASE)
-    if effet_match:
-        cue_notes.append(f"Effet: {effet_match.group(1).strip()}")
+    if "effet:" in lowered:
+        effet_match = _EFFET_RE.search(scene_text)
+        if effet_match:
+            cue_notes.append(f"Effet: {effet_match.group(1).strip()}")
     
     # Energie
-    energie_match = re.search(r'Energie:\s*([^\n]+)', scene_text, re.IGNORECASE)
-    if energie_match:
-        cue_notes.append(f"Energie: {energie_match.group(1).strip()}")
+    if "energie:" in lowered:
+        energie_match = _ENERGIE_RE.search(scene_text)
+        if energie_match:
+            cue_notes.append(f"Energie: {energie_match.group(1).strip()}")
     
     # Extrahiere Text (alles nach den Parametern bis zur nächsten Szene oder Seitenende)
     # Suche nach englischem Text (beginnt meist mit Großbuchstaben)
@@ -90,27 +149,14 @@ def extract_scene_info(text: str, position: str) -> dict:
         text_start_pos = scene_text.find("\n", energie_pos)
         remaining_text = scene_text[text_start_pos:] if text_start_pos > 0 else scene_text[energie_pos:]
         
-        # Suche nach englischem Text (beginnt mit Großbuchstaben)
-        # Unterstützt Zeilenumbrüche zwischen Wörtern
-        text_patterns = [
-            r'(If\s+ball\s+\d+\s+[^0-9]+?)(?=\d+\.\d+\.|$)',
-            r'(If\s+[^0-9]+?)(?=\d+\.\d+\.|$)',
-            r'(No\s+[^0-9]+?)(?=\d+\.\d+\.|$)',
-            r'(This\s+[^0-9]+?)(?=\d+\.\d+\.|$)',
-            r'(Ball\s+\d+\s+[^0-9]+?)(?=\d+\.\d+\.|$)',
-            r'(The\s+[^0-9]+?)(?=\d+\.\d+\.|$)',
-        ]
-        
+        # Suche nach englischem Text (siehe _TEXT_RE)
         original_excerpt = None
-        for pattern in text_patterns:
-            match = re.search(pattern, remaining_text, re.IGNORECASE | re.DOTALL)
-            if match:
-                original_excerpt = match.group(1).strip()
-                # Bereinige den Text (entferne Zeilenumbrüche, extra Leerzeichen)
-                original_excerpt = re.sub(r'\s+', ' ', original_excerpt)
-                # Entferne einzelne Buchstaben am Ende (OCR-Artefakte)
-                original_excerpt = re.sub(r'\s+[a-z]\s*$', '', original_excerpt)
-                break
+        match = _TEXT_RE.search(remaining_text)
+        if match:
+            original_excerpt = match.group(1).strip()
+            # Bereinige den Text (entferne Zeilenumbrüche, extra Leerzeichen,
+            # einzelne Buchstaben am Ende als OCR-Artefakte)
+            original_excerpt = _EXCERPT_SPACING_RE.sub(_excerpt_spacing, original_excerpt)
     else:
         original_excerpt = None
     
@@ -121,11 +167,28 @@ def extract_scene_info(text: str, position: str) -> dict:
     }
 
 
-def update_yaml_file(yaml_path: Path, scene_info: dict) -> None:
-    """Aktualisiert eine YAML-Datei mit extrahierten Informationen."""
-    with yaml_path.open("r", encoding="utf-8") as fh:
-        data = yaml.safe_load(fh)
-    
+def load_yaml_files(scene_ids: list[str]) -> dict[str, dict]:
+    """Lädt alle vorhandenen Szenen-YAMLs in ein Dict (scene_id → Daten)."""
+    scenes: dict[str, dict] = {}
+    for scene_id in scene_ids:
+        yaml_path = YAML_DIR / f"{scene_id}.yaml"
+        if not yaml_path.exists():
+            continue
+        with yaml_path.open("r", encoding="utf-8") as fh:
+            scenes[scene_id] = yaml.load(fh, Loader=_SafeLoader)
+    return scenes
+
+
+def write_yaml_files(scenes: dict[str, dict]) -> None:
+    """Schreibt die (aktualisierten) Szenen-Dicts zurück in ihre YAML-Dateien."""
+    for scene_id, data in scenes.items():
+        yaml_path = YAML_DIR / f"{scene_id}.yaml"
+        with yaml_path.open("w", encoding="utf-8") as fh:
+            yaml.dump(data, fh, Dumper=_SceneDumper, allow_unicode=True, sort_keys=False, default_flow_style=False)
+
+
+def apply_scene_info(data: dict, scene_info: dict) -> None:
+    """Überträgt extrahierte Informationen in ein geladenes Szenen-Dict."""
     scene = data.get("scene", {})
     
     # Aktualisiere Titel
@@ -143,13 +206,14 @@ def update_yaml_file(yaml_path: Path, scene_info: dict) -> None:
         if "text" not in scene:
             scene["text"] = {}
         scene["text"]["original_excerpt"] = scene_info["original_excerpt"]
-    
-    with yaml_path.open("w", encoding="utf-8") as fh:
-        yaml.safe_dump(data, fh, allow_unicode=True, sort_keys=False, default_flow_style=False)
 
 
 def main():
     """Hauptfunktion."""
+    if not HAS_PDFPLUMBER:
+        print("Fehler: pdfplumber nicht installiert. Bitte installieren: pip install pdfplumber")
+        exit(1)
+    
     if not PDF_PATH.exists():
         print(f"Fehler: PDF nicht gefunden: {PDF_PATH}")
         return
@@ -157,6 +221,9 @@ def main():
     print("Extrahiere Text aus PDF für Width Gather Shots...")
     print()
     
+    # Alle YAMLs einmal laden, im Speicher aktualisieren und am Ende gesammelt schreiben
+    scenes = load_yaml_files([f"VS-width-02-{n:02d}" for n in range(1, 34)])
+    updated: dict[str, dict] = {}
     scene_num = 1
     
     with pdfplumber.open(PDF_PATH) as pdf:
@@ -166,26 +233,26 @@ def main():
                 print(f"  ⚠ Seite {page_num + 1} existiert nicht im PDF")
                 continue
             
-            page = pdf.pages[page_num]
-            text = page.extract_text()
+            text = extract_page_text(pdf.pages[page_num])
             
             if not text:
                 print(f"  ⚠ Seite {page_num + 1}: Kein Text gefunden")
                 continue
             
             # Extrahiere Informationen für beide Szenen
-            for position in ["oben", "unten"]:
+            halves = dict(zip(["oben", "unten"], split_halves(text)))
+            for position, scene_text in halves.items():
                 scene_id = f"VS-width-02-{scene_num:02d}"
-                yaml_path = YAML_DIR / f"{scene_id}.yaml"
                 
-                if not yaml_path.exists():
+                if scene_id not in scenes:
                     print(f"  ⚠ {scene_id}.yaml nicht gefunden, überspringe")
                     scene_num += 1
                     continue
                 
-                scene_info = extract_scene_info(text, position)
+                scene_info = extract_scene_info(scene_text)
                 
-                update_yaml_file(yaml_path, scene_info)
+                apply_scene_info(scenes[scene_id], scene_info)
+                updated[scene_id] = scenes[scene_id]
                 
                 print(f"  ✓ {scene_id}.yaml ({position})")
                 if scene_info["title"]:
@@ -197,23 +264,23 @@ def main():
         if scene_num <= 33:
             page_num = 270  # 0-indexed, Seite 271
             if page_num < len(pdf.pages):
-                page = pdf.pages[page_num]
-                text = page.extract_text()
+                text = extract_page_text(pdf.pages[page_num])
                 
                 scene_id = f"VS-width-02-{scene_num:02d}"
-                yaml_path = YAML_DIR / f"{scene_id}.yaml"
                 
-                if yaml_path.exists():
-                    scene_info = extract_scene_info(text, "oben")
-                    update_yaml_file(yaml_path, scene_info)
+                if scene_id in scenes:
+                    scene_info = extract_scene_info(split_halves(text)[0])
+                    apply_scene_info(scenes[scene_id], scene_info)
+                    updated[scene_id] = scenes[scene_id]
                     print(f"  ✓ {scene_id}.yaml (oben)")
                     if scene_info["title"]:
                         print(f"      Titel: {scene_info['title'][:60]}...")
     
+    write_yaml_files(updated)
+    
     print()
     print("✓ Text-Extraktion abgeschlossen!")
 
 
 if __name__ == "__main__":
     main()
-
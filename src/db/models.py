@@ -10,6 +10,7 @@ from sqlalchemy import (
     CheckConstraint,
     Enum,
     ForeignKey,
+    Index,
     Integer,
     String,
     Text,
@@ -65,7 +66,7 @@ class Scene(Base):
         primary_key=True,
         default=uuid.uuid4,
     )
-    scene_key: Mapped[str] = mapped_column(String(64), unique=True, nullable=False)
+    scene_key: Mapped[str] = mapped_column(String(64), unique=True, index=True, nullable=False)
     title: Mapped[str] = mapped_column(String(200), nullable=False)
     description: Mapped[Optional[str]] = mapped_column(Text())
     difficulty: Mapped[str] = mapped_column(String(16), nullable=False)
@@ -88,24 +89,36 @@ class Scene(Base):
         TIMESTAMP(timezone=True), nullable=False, server_default=text("now()"), onupdate=datetime.utcnow
     )
 
-    ball_positions: Mapped[list[BallPosition]] = relationship(back_populates="scene", cascade="all, delete-orphan")
+    # Szenen werden praktisch immer mit allen Kind-Daten gebraucht: per "selectin"
+    # eine Abfrage je Relation für alle geladenen Szenen statt Lazy-Load pro Szene (N+1)
+    ball_positions: Mapped[list[BallPosition]] = relationship(
+        back_populates="scene", cascade="all, delete-orphan", lazy="selectin"
+    )
     cue_parameters: Mapped[Optional[CueParameters]] = relationship(
-        back_populates="scene", cascade="all, delete-orphan", uselist=False
+        back_populates="scene", cascade="all, delete-orphan", uselist=False, lazy="selectin"
     )
     tempo_force: Mapped[Optional[TempoForce]] = relationship(
-        back_populates="scene", cascade="all, delete-orphan", uselist=False
+        back_populates="scene", cascade="all, delete-orphan", uselist=False, lazy="selectin"
     )
     trajectory_segments: Mapped[list[TrajectorySegment]] = relationship(
-        back_populates="scene", cascade="all, delete-orphan", order_by="TrajectorySegment.sequence_index"
+        back_populates="scene",
+        cascade="all, delete-orphan",
+        order_by="TrajectorySegment.sequence_index",
+        lazy="selectin",
+    )
+    notes: Mapped[list[SceneNote]] = relationship(
+        back_populates="scene", cascade="all, delete-orphan", lazy="selectin"
+    )
+    sources: Mapped[list[SceneSourceAsset]] = relationship(
+        back_populates="scene", cascade="all, delete-orphan", lazy="selectin"
     )
-    notes: Mapped[list[SceneNote]] = relationship(back_populates="scene", cascade="all, delete-orphan")
-    sources: Mapped[list[SceneSourceAsset]] = relationship(back_populates="scene", cascade="all, delete-orphan")
 
 
 class BallPosition(Base):
     __tablename__ = "ball_position"
     __table_args__ = (
         UniqueConstraint("scene_id", "ball_name", name="uq_ball_position_scene_ball"),
+        Index("ix_ball_position_ball", "ball_name", "scene_id"),
     )
 
     id: Mapped[int] = mapped_column(primary_key=True, autoincrement=True)
@@ -149,6 +162,16 @@ class TrajectorySegment(Base):
     __tablename__ = "trajectory_segment"
     __table_args__ = (
         CheckConstraint("sequence_index >= 0", name="ck_segment_sequence_nonnegative"),
+        # Scene.trajectory_segments lädt per scene_id sortiert nach sequence_index
+        Index("ix_trajectory_scene_sequence", "scene_id", "sequence_index"),
+        Index("ix_trajectory_ball_scene", "ball_name", "scene_id", "sequence_index"),
+        # Ereignisse sind selten gesetzt: partieller Index nur über markierte Segmente
+        Index(
+            "ix_trajectory_scene_event",
+            "scene_id",
+            "event_kind",
+            postgresql_where=text("event_kind IS NOT NULL"),
+        ),
     )
 
     id: Mapped[int] = mapped_column(primary_key=True, autoincrement=True)
@@ -168,7 +191,9 @@ class SceneNote(Base):
     __tablename__ = "scene_note"
 
     id: Mapped[int] = mapped_column(primary_key=True, autoincrement=True)
-    scene_id: Mapped[UUID] = mapped_column(ForeignKey("scene.id", ondelete="CASCADE"), nullable=False)
+    scene_id: Mapped[UUID] = mapped_column(
+        ForeignKey("scene.id", ondelete="CASCADE"), nullable=False, index=True
+    )
     content: Mapped[str] = mapped_column(Text(), nullable=False)
 
     scene: Mapped[Scene] = relationship(back_populates="notes")
@@ -178,7 +203,9 @@ class SceneSourceAsset(Base):
     __tablename__ = "scene_source_asset"
 
     id: Mapped[int] = mapped_column(primary_key=True, autoincrement=True)
-    scene_id: Mapped[UUID] = mapped_column(ForeignKey("scene.id", ondelete="CASCADE"), nullable=False)
+    scene_id: Mapped[UUID] = mapped_column(
+        ForeignKey("scene.id", ondelete="CASCADE"), nullable=False, index=True
+    )
     asset_type: Mapped[str] = mapped_column(String(50), nullable=False)
     uri: Mapped[str] = mapped_column(String(500), nullable=False)
     description: Mapped[Optional[str]] = mapped_column(Text())
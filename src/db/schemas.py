@@ -1,8 +1,8 @@
 from __future__ import annotations
 
-from typing import Dict, List, Literal
+from typing import Any, Dict, List, Literal
 
-from pydantic import BaseModel, Field, validator
+from pydantic import BaseModel, Field, field_serializer, field_validator
 
 from src.db.models import (
     BallName,
@@ -31,18 +31,25 @@ class TableModel(BaseModel):
     physical_size_cm: List[float] | None = None
     variant: TableVariant
 
-    @validator("size_units")
+    @field_validator("size_units", mode="after")
+    @classmethod
     def validate_size_units(cls, value: List[float]) -> List[float]:
         if len(value) != 2:
             raise ValueError("size_units must have two values [width, height]")
         return value
 
+    @field_serializer("variant")
+    def serialize_variant(self, value: TableVariant) -> str:
+        # auch model_dump() im Python-Modus liefert JSON-taugliche Werte (metadata_json)
+        return value.value
+
 
 class BallPositionModel(BaseModel):
     color: str
     position: List[float]
 
-    @validator("position")
+    @field_validator("position", mode="after")
+    @classmethod
     def validate_position(cls, value: List[float]) -> List[float]:
         if len(value) != 2:
             raise ValueError("Ball position must contain [x, y]")
@@ -67,7 +74,8 @@ class CueModel(BaseModel):
     cue_inclination_deg: float | None = None
     notes: List[str] | None = None
 
-    @validator("cue_direction")
+    @field_validator("cue_direction", mode="after")
+    @classmethod
     def validate_direction(cls, value: List[float]) -> List[float]:
         if len(value) != 2:
             raise ValueError("cue_direction must have two components [x, y]")
@@ -86,7 +94,8 @@ class TrajectoryPointModel(BaseModel):
     event: str | None = None
     notes: str | None = None
 
-    @validator("point")
+    @field_validator("point", mode="after")
+    @classmethod
     def validate_point(cls, value: List[float]) -> List[float]:
         if len(value) != 2:
             raise ValueError("trajectory point must contain [x, y]")
@@ -115,6 +124,44 @@ class SceneModel(BaseModel):
     text: TextBlockModel | None = None
     remarks: List[str] = Field(default_factory=list)
 
+    @classmethod
+    def from_trusted(cls, data: Dict[str, Any]) -> SceneModel:
+        """Baut das Modell ohne Validierung (model_construct) aus vertrauenswürdigen Daten.
+
+        Nur für Szenen, die zuvor aus einem validierten SceneModel geschrieben wurden
+        (z.B. das Rückschreiben in capture); Enum-Felder werden trotzdem konvertiert.
+        """
+        fields = dict(data)
+        fields["source"] = SourceModel.model_construct(**data["source"])
+        fields["difficulty"] = Difficulty(data["difficulty"])
+        fields["table"] = TableModel.model_construct(
+            **{**data["table"], "variant": TableVariant(data["table"]["variant"])}
+        )
+        fields["balls"] = {
+            name: BallPositionModel.model_construct(**ball) for name, ball in data["balls"].items()
+        }
+        if data.get("ghost_ball") is not None:
+            fields["ghost_ball"] = GhostBallModel.model_construct(**data["ghost_ball"])
+        if data.get("ball_contact") is not None:
+            fields["ball_contact"] = BallContactModel.model_construct(**data["ball_contact"])
+        if data.get("cue") is not None:
+            cue = dict(data["cue"])
+            if "effect_stage" in cue:
+                cue["effect_stage"] = EffectStage(cue["effect_stage"])
+            if "effect_side" in cue:
+                cue["effect_side"] = EffectSide(cue["effect_side"])
+            fields["cue"] = CueModel.model_construct(**cue)
+        if data.get("tempo_force") is not None:
+            fields["tempo_force"] = TempoForceModel.model_construct(**data["tempo_force"])
+        if "trajectory" in data:
+            fields["trajectory"] = {
+                ball: [TrajectoryPointModel.model_construct(**point) for point in points]
+                for ball, points in data["trajectory"].items()
+            }
+        if data.get("text") is not None:
+            fields["text"] = TextBlockModel.model_construct(**data["text"])
+        return cls.model_construct(**fields)
+
     def require_ball(self, ball: BallName) -> BallPositionModel:
         key = ball.value
         if key not in self.balls:
@@ -3,11 +3,29 @@ from __future__ import annotations
 from contextlib import contextmanager
 
 from sqlalchemy import create_engine
+from sqlalchemy.engine import make_url
 from sqlalchemy.orm import Session, sessionmaker
+from sqlalchemy.pool import QueuePool
 
 from src.config import settings
 
-engine = create_engine(settings.database_url, echo=False, future=True)
+# Poolgröße nur für QueuePool-Dialekte (PostgreSQL, SQLite-Datei); sqlite:// nutzt SingletonThreadPool
+# und lehnt pool_size/max_overflow ab
+_url = make_url(settings.database_url)
+_pool_args = (
+    {"pool_size": 10, "max_overflow": 20}
+    if issubclass(_url.get_dialect().get_pool_class(_url), QueuePool)
+    else {}
+)
+
+engine = create_engine(
+    settings.database_url,
+    echo=False,
+    future=True,
+    pool_pre_ping=True,
+    pool_recycle=1800,
+    **_pool_args,
+)
 SessionLocal = sessionmaker(bind=engine, autoflush=False, autocommit=False, expire_on_commit=False)
 
 
@@ -1,164 +1,403 @@
 from __future__ import annotations
 
+import hashlib
+import json
+import os
+import re
+import uuid
+from concurrent.futures import ProcessPoolExecutor
+from functools import lru_cache, partial
 from pathlib import Path
 from typing import Iterable
 
 import yaml
+from pydantic import TypeAdapter
+# pydantic verlangt unter Python < 3.12 TypedDict aus typing_extensions
+from typing_extensions import TypedDict
+from sqlalchemy import delete, func, insert
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
 from sqlalchemy.orm import Session
 
-from sqlalchemy.orm import object_session
-
 from src.db import models
 from src.db.schemas import SceneModel
 
 
+class _SceneFile(TypedDict):
+    scene: SceneModel
+
+
+# Einmal aufgebauter Validator für den Dateiinhalt ({"scene": ...}), weitere Schlüssel werden ignoriert
+_SCENE_FILE_ADAPTER = TypeAdapter(_SceneFile)
+
+# libyaml-Bindings verwenden, falls verfügbar (deutlich schneller als reines Python)
+try:
+    from yaml import CSafeLoader as _SafeLoader
+except ImportError:  # pragma: no cover
+    from yaml import SafeLoader as _SafeLoader
+
+# Ab dieser Zeilenzahl werden Kind-Tabellen per COPY statt INSERT befüllt
+COPY_THRESHOLD = 100
+
+# Ab dieser Dateizahl werden YAMLs parallel geladen (darunter überwiegt der Prozessstart)
+PARALLEL_LOAD_THRESHOLD = 32
+
+# Szenen pro gesammeltem Upsert (hält die Bind-Parameter je Statement begrenzt)
+UPSERT_BATCH_SIZE = 500
+
+# Kind-Tabellen, die bei jedem Upsert einer Szene neu geschrieben werden
+_CHILD_MODELS = (
+    models.BallPosition,
+    models.CueParameters,
+    models.TempoForce,
+    models.TrajectorySegment,
+    models.SceneNote,
+    models.SceneSourceAsset,
+)
+
+
+def _bulk_insert(session: Session, model: type[models.Base], rows: list[dict]) -> None:
+    """Fügt viele Zeilen in die Tabelle von ``model`` ein.
+
+    Unter PostgreSQL/psycopg wird oberhalb von ``COPY_THRESHOLD`` ``COPY FROM STDIN``
+    verwendet, sonst ein executemany-INSERT.
+    """
+    if not rows:
+        return
+    connection = session.connection()
+    if len(rows) >= COPY_THRESHOLD and connection.dialect.driver == "psycopg":
+        table = model.__table__
+        columns = list(rows[0])
+        statement = f"COPY {table.name} ({', '.join(columns)}) FROM STDIN"
+        with connection.connection.driver_connection.cursor() as cursor:
+            with cursor.copy(statement) as copy:
+                for row in rows:
+                    copy.write_row([row[column] for column in columns])
+    else:
+        session.execute(insert(model), rows)
+
+
+# Seitennummer in Angaben wie "270 oben"
+_PAGE_NUM_RE = re.compile(r"\d+")
+
+
+@lru_cache(maxsize=256)
+def extract_page_number(page: int | str | None) -> int | None:
+    """Extrahiert die Seitennummer aus einem page-Wert.
+
+    Args:
+        page: Seitenzahl als Integer oder String (z.B. "270", "270 oben", "270 unten")
+
+    Returns:
+        Seitennummer als Integer oder None
+    """
+    if page is None:
+        return None
+    if type(page) is int:
+        return page
+    # Extrahiere Zahl aus String (z.B. "270 oben" -> 270)
+    match = _PAGE_NUM_RE.search(str(page))
+    return int(match.group()) if match else None
+
+# Schneller Vorab-Test: ohne "todo" irgendwo in der Datei ist kein Ersetzen nötig
+_TODO_BYTES_RE = re.compile(rb"(?i)todo")
 
 
 def _replace_todo(value):
+    """Ersetzt Platzhalter-Strings "TODO" (ganzer Wert, beliebige Schreibweise) rekursiv durch 0.0.
+
+    Arbeitet auf den geparsten Werten, damit Texte (auch Block-Skalare wie ``|``) unverändert bleiben.
+    """
     if isinstance(value, dict):
         return {k: _replace_todo(v) for k, v in value.items()}
     if isinstance(value, list):
         return [_replace_todo(v) for v in value]
-    if isinstance(value, str) and value.strip().upper() == "TODO":
-        return 0.0
+    if isinstance(value, str):
+        # Längen-Check vor upper(): fast alle Strings sind keine Platzhalter
+        stripped = value.strip()
+        if len(stripped) == 4 and stripped.upper() == "TODO":
+            return 0.0
     return value
 
-def load_scene_yaml(path: Path) -> SceneModel:
-    with path.open() as fh:
-        raw = yaml.safe_load(fh)
+
+# Validierte Szenen werden neben der Quelldatei als versteckte JSON-Datei abgelegt
+# (.<datei>.cache.json, damit Shell-Globs wie *.json sie nicht erfassen) und wiederverwendet,
+# solange Inhalts-Hash der Quelldatei und Fingerabdruck passen (mtime reicht nicht: cp -p, rsync -t, Archive)
+SCENE_CACHE_SUFFIX = ".cache.json"
+
+# Bei Änderungen am Laden (z.B. TODO-Behandlung) erhöhen; Schemaänderungen erkennt der Fingerabdruck selbst
+_SCENE_CACHE_VERSION = 1
+
+
+@lru_cache(maxsize=1)
+def _scene_cache_fingerprint() -> str:
+    """Fingerabdruck aus Cache-Version und JSON-Schema von SceneModel."""
+    schema = json.dumps(SceneModel.model_json_schema(), sort_keys=True)
+    return hashlib.sha256(f"{_SCENE_CACHE_VERSION}:{schema}".encode()).hexdigest()
+
+
+def _scene_cache_path(path: Path) -> Path:
+    return path.with_name(f".{path.name}{SCENE_CACHE_SUFFIX}")
+
+
+def _read_scene_cache(path: Path, source_hash: str) -> SceneModel | None:
+    try:
+        cached = json.loads(_scene_cache_path(path).read_bytes())
+    except (OSError, ValueError):
+        # Fehlender oder beschädigter Cache: neu parsen
+        return None
+    if (
+        not isinstance(cached, dict)
+        or cached.get("fingerprint") != _scene_cache_fingerprint()
+        or cached.get("source_sha256") != source_hash
+    ):
+        return None
+    # Der Inhalt stammt aus einem validierten SceneModel mit identischem Schema
+    return SceneModel.from_trusted(cached["scene"])
+
+
+def _write_scene_cache(path: Path, source_hash: str, scene: SceneModel) -> None:
+    cache_path = _scene_cache_path(path)
+    tmp_path = cache_path.with_name(f"{cache_path.name}.{os.getpid()}.tmp")
+    payload = {
+        "fingerprint": _scene_cache_fingerprint(),
+        "source_sha256": source_hash,
+        "scene": scene.model_dump(mode="json"),
+    }
+    try:
+        tmp_path.write_text(json.dumps(payload, ensure_ascii=False), encoding="utf-8")
+        os.replace(tmp_path, cache_path)
+    except OSError:
+        # Schreibgeschütztes Verzeichnis o.ä.: dann eben ohne Cache
+        tmp_path.unlink(missing_ok=True)
+
+
+def load_scene_yaml(path: Path, trusted: bool = False) -> SceneModel:
+    """Lädt eine Szenendatei; ``trusted`` überspringt die Validierung für selbst geschriebene Dateien.
+
+    Validierte Ergebnisse werden in ``.<datei>.cache.json`` abgelegt und bei unverändertem
+    Dateiinhalt ohne YAML-Parser und Pydantic-Validierung zurückgegeben.
+    """
+    raw_bytes = path.read_bytes()
+    source_hash = hashlib.sha256(raw_bytes).hexdigest()
+    cached = _read_scene_cache(path, source_hash)
+    if cached is not None:
+        return cached
+    scene = _parse_scene_bytes(path, raw_bytes, trusted)
+    # Nur validierte Szenen cachen, sonst würde ein späterer ungeprüfter Aufruf ungeprüfte Daten erhalten
+    if not trusted:
+        _write_scene_cache(path, source_hash, scene)
+    return scene
+
+
+def _parse_scene_bytes(path: Path, raw_bytes: bytes, trusted: bool) -> SceneModel:
+    has_todo = _TODO_BYTES_RE.search(raw_bytes) is not None
+    # .json-Szenen (z.B. aus extract_width_gather.py --json) ohne Platzhalter direkt aus den
+    # Bytes validieren, ohne YAML-Parser und ohne Python-Dict als Zwischenschritt
+    if path.suffix == ".json" and not trusted and not has_todo:
+        return _SCENE_FILE_ADAPTER.validate_json(raw_bytes)["scene"]
+    if path.suffix == ".json":
+        raw = json.loads(raw_bytes)
+    else:
+        raw = yaml.load(raw_bytes, Loader=_SafeLoader)
     if not isinstance(raw, dict) or "scene" not in raw:
         raise ValueError(f"YAML file {path} does not contain a 'scene' root object")
-    cleaned = _replace_todo(raw["scene"])
-    return SceneModel.model_validate(cleaned)
-
-
-def upsert_scene(session: Session, scene_data: SceneModel) -> models.Scene:
-    scene = (
-        session.query(models.Scene)
-        .filter(models.Scene.scene_key == scene_data.id)
-        .one_or_none()
-    )
-    if scene is None:
-        scene = models.Scene(scene_key=scene_data.id)
-        session.add(scene)
-
-    scene.title = scene_data.title
-    scene.description = scene_data.description
-    scene.difficulty = scene_data.difficulty.value
-    scene.source_work = scene_data.source.work
-    scene.source_section = scene_data.source.section
+    if has_todo:
+        raw["scene"] = _replace_todo(raw["scene"])
+    if trusted:
+        return SceneModel.from_trusted(raw["scene"])
+    return _SCENE_FILE_ADAPTER.validate_python(raw)["scene"]
+
+
+def _scene_row(scene_data: SceneModel) -> dict:
+    """Spaltenwerte der scene-Zeile (ohne id) für eine Szene."""
+    source = scene_data.source
+    table = scene_data.table
     # Extrahiere Seitennummer (kann String wie "270 oben" sein)
-    if scene_data.source.page is not None:
-        if isinstance(scene_data.source.page, int):
-            scene.source_page = scene_data.source.page
-        else:
-            # Extrahiere Zahl aus String
-            import re
-            match = re.search(r'\d+', str(scene_data.source.page))
-            scene.source_page = int(match.group()) if match else None
-    else:
-        scene.source_page = None
+    source_page = extract_page_number(source.page)
 
-    scene.table_variant = scene_data.table.variant.value
-    scene.table_width_units = scene_data.table.size_units[0]
-    scene.table_height_units = scene_data.table.size_units[1]
-    scene.grid_resolution = scene_data.table.grid_resolution
-    metadata = {"table": scene_data.table.model_dump(mode="json")}
+    metadata = {"table": table.model_dump()}
     if scene_data.text:
-        metadata["text"] = scene_data.text.model_dump(mode="json")
-    scene.metadata_json = metadata
-
-    session_ref = object_session(scene)
-
-    scene.ball_positions.clear()
-    if session_ref is not None:
-        session_ref.flush()
-    for name, payload in scene_data.balls.items():
-        x, y = payload.position
-        scene.ball_positions.append(
-            models.BallPosition(
-                ball_name=name,
-                color=payload.color,
-                x=x,
-                y=y,
-                is_ghost=False,
-            )
-        )
+        metadata["text"] = scene_data.text.model_dump()
+
+    width_units, height_units = table.size_units
+    return {
+        "scene_key": scene_data.id,
+        "title": scene_data.title,
+        "description": scene_data.description,
+        "difficulty": scene_data.difficulty.value,
+        "source_work": source.work,
+        "source_section": source.section,
+        "source_page": source_page,
+        "table_variant": table.variant.value,
+        "table_width_units": width_units,
+        "table_height_units": height_units,
+        "grid_resolution": table.grid_resolution,
+        "metadata_json": metadata,
+    }
 
+
+def _child_rows(scene_id: uuid.UUID, scene_data: SceneModel) -> dict[type, list[dict]]:
+    """Zeilen aller Kind-Tabellen einer Szene, gruppiert nach Modell."""
+    ball_rows = [
+        {
+            "scene_id": scene_id,
+            "ball_name": name,
+            "color": payload.color,
+            "x": payload.position[0],
+            "y": payload.position[1],
+            "is_ghost": False,
+        }
+        for name, payload in scene_data.balls.items()
+    ]
     if scene_data.ghost_ball:
         gx, gy = scene_data.ghost_ball.position
-        scene.ball_positions.append(
-            models.BallPosition(
-                ball_name=models.BallName.GHOST.value,
-                color="ghost",
-                x=gx,
-                y=gy,
-                is_ghost=True,
-            )
+        ball_rows.append(
+            {
+                "scene_id": scene_id,
+                "ball_name": models.BallName.GHOST.value,
+                "color": "ghost",
+                "x": gx,
+                "y": gy,
+                "is_ghost": True,
+            }
         )
 
-    if scene_data.cue:
-        if scene.cue_parameters is None:
-            scene.cue_parameters = models.CueParameters()
-        scene.cue_parameters.attack_height = scene_data.cue.attack_height
-        scene.cue_parameters.effect_stage = scene_data.cue.effect_stage.value
-        scene.cue_parameters.effect_side = scene_data.cue.effect_side.value
-        scene.cue_parameters.cue_inclination_deg = scene_data.cue.cue_inclination_deg
-        scene.cue_parameters.notes = "\n".join(scene_data.cue.notes or []) or None
-    else:
-        scene.cue_parameters = None
+    trajectory_rows = [
+        {
+            "scene_id": scene_id,
+            "ball_name": getattr(ball_key, "value", ball_key),
+            "sequence_index": index,
+            "path_type": segment.path_type,
+            "point_x": segment.point[0],
+            "point_y": segment.point[1],
+            "event_kind": segment.event,
+            "notes": segment.notes,
+        }
+        for ball_key, segments in scene_data.trajectory.items()
+        for index, segment in enumerate(segments)
+    ]
 
+    note_contents = list(scene_data.remarks)
+    if scene_data.text:
+        note_contents.append(f"{scene_data.text.original_language}: {scene_data.text.original_excerpt.strip()}")
+        if scene_data.text.de_summary:
+            note_contents.append(f"de_summary: {scene_data.text.de_summary.strip()}")
+
+    rows: dict[type, list[dict]] = {
+        models.BallPosition: ball_rows,
+        models.TrajectorySegment: trajectory_rows,
+        models.SceneNote: [{"scene_id": scene_id, "content": content} for content in note_contents],
+        models.SceneSourceAsset: [
+            {
+                "scene_id": scene_id,
+                "asset_type": "image",
+                "uri": str(Path("data/raw/gretillat") / f"{scene_data.id}.png"),
+                "description": scene_data.source.section,
+            }
+        ],
+        models.CueParameters: [],
+        models.TempoForce: [],
+    }
+    if scene_data.cue:
+        rows[models.CueParameters].append(
+            {
+                "scene_id": scene_id,
+                "attack_height": scene_data.cue.attack_height,
+                "effect_stage": scene_data.cue.effect_stage.value,
+                "effect_side": scene_data.cue.effect_side.value,
+                "cue_inclination_deg": scene_data.cue.cue_inclination_deg,
+                "notes": "\n".join(scene_data.cue.notes or []) or None,
+            }
+        )
     if scene_data.tempo_force:
-        if scene.tempo_force is None:
-            scene.tempo_force = models.TempoForce()
-        scene.tempo_force.tempo = scene_data.tempo_force.tempo
-        scene.tempo_force.force = scene_data.tempo_force.force
-        scene.tempo_force.comments = scene_data.tempo_force.comments
-    else:
-        scene.tempo_force = None
-
-    scene.trajectory_segments.clear()
-    for ball_key, segments in scene_data.trajectory.items():
-        for index, segment in enumerate(segments):
-            px, py = segment.point
-            scene.trajectory_segments.append(
-                models.TrajectorySegment(
-                    ball_name=getattr(ball_key, "value", ball_key),
-                    sequence_index=index,
-                    path_type=segment.path_type,
-                    point_x=px,
-                    point_y=py,
-                    event_kind=segment.event,
-                    notes=segment.notes,
-                )
-            )
+        rows[models.TempoForce].append(
+            {
+                "scene_id": scene_id,
+                "tempo": scene_data.tempo_force.tempo,
+                "force": scene_data.tempo_force.force,
+                "comments": scene_data.tempo_force.comments,
+            }
+        )
+    return rows
 
-    scene.notes.clear()
-    scene.notes.extend(models.SceneNote(content=remark) for remark in scene_data.remarks)
 
-    if scene_data.text:
-        text_note = f"{scene_data.text.original_language}: {scene_data.text.original_excerpt.strip()}"
-        scene.notes.append(models.SceneNote(content=text_note))
-        if scene_data.text.de_summary:
-            scene.notes.append(models.SceneNote(content=f"de_summary: {scene_data.text.de_summary.strip()}"))
-
-    scene.sources.clear()
-    scene.sources.append(
-        models.SceneSourceAsset(
-            asset_type="image",
-            uri=str(Path("data/raw/gretillat") / f"{scene_data.id}.png"),
-            description=scene_data.source.section,
+def _upsert_insert(session: Session):
+    """INSERT-Konstrukt mit ON CONFLICT für den Dialekt der Session (PostgreSQL; SQLite für Tests/lokal)."""
+    if session.get_bind().dialect.name == "sqlite":
+        return sqlite_insert
+    return pg_insert
+
+
+def upsert_scenes(session: Session, scenes: Iterable[SceneModel]) -> dict[str, uuid.UUID]:
+    """Legt Szenen an oder aktualisiert sie (per scene_key), gesammelt in wenigen Statements.
+
+    Pro Block von ``UPSERT_BATCH_SIZE`` Szenen: ein INSERT ... ON CONFLICT für alle
+    scene-Zeilen, ein DELETE und ein Bulk-INSERT je Kind-Tabelle.
+    Gibt scene_key → ID zurück; bei doppelten Keys gewinnt die letzte Szene.
+    """
+    by_key = {scene_data.id: scene_data for scene_data in scenes}
+    scene_ids: dict[str, uuid.UUID] = {}
+    batch_keys = list(by_key)
+    for start in range(0, len(batch_keys), UPSERT_BATCH_SIZE):
+        batch = [by_key[key] for key in batch_keys[start:start + UPSERT_BATCH_SIZE]]
+
+        # Ein Statement statt SELECT + INSERT/UPDATE: Konflikt auf scene_key aktualisiert die Zeile
+        scene_rows = [_scene_row(scene_data) for scene_data in batch]
+        statement = _upsert_insert(session)(models.Scene).values(
+            [{"id": uuid.uuid4(), **row} for row in scene_rows]
         )
-    )
+        update_columns = {
+            name: statement.excluded[name] for name in scene_rows[0] if name != "scene_key"
+        }
+        statement = statement.on_conflict_do_update(
+            index_elements=[models.Scene.scene_key],
+            set_={**update_columns, "updated_at": func.now()},
+        ).returning(models.Scene.scene_key, models.Scene.id)
+        batch_ids = dict(session.execute(statement).all())
+        scene_ids.update(batch_ids)
+
+        # Kind-Tabellen: alte Zeilen per DELETE entfernen und neue gesammelt einfügen,
+        # statt sie einzeln über die ORM-Collections (clear/append) zu verwalten
+        child_rows: dict[type, list[dict]] = {child_model: [] for child_model in _CHILD_MODELS}
+        for scene_data in batch:
+            for child_model, rows in _child_rows(batch_ids[scene_data.id], scene_data).items():
+                child_rows[child_model].extend(rows)
+        for child_model in _CHILD_MODELS:
+            session.execute(
+                delete(child_model).where(child_model.scene_id.in_(batch_ids.values())),
+                execution_options={"synchronize_session": False},
+            )
+            _bulk_insert(session, child_model, child_rows[child_model])
+    return scene_ids
+
+
+def upsert_scene(session: Session, scene_data: SceneModel) -> uuid.UUID:
+    """Legt eine Szene an oder aktualisiert sie (per scene_key) und gibt ihre ID zurück."""
+    return upsert_scenes(session, [scene_data])[scene_data.id]
+
+
+def load_scene_files(scene_paths: Iterable[Path], trusted: bool = False) -> list[SceneModel]:
+    """Lädt und validiert Szenendateien; größere Mengen parallel in Worker-Prozessen."""
+    paths = list(scene_paths)
+    load = partial(load_scene_yaml, trusted=trusted)
+    if len(paths) < PARALLEL_LOAD_THRESHOLD:
+        return [load(path) for path in paths]
+    with ProcessPoolExecutor() as executor:
+        return list(executor.map(load, paths, chunksize=16))
 
-    return scene
 
+def import_scenes(session: Session, scene_paths: Iterable[Path], trusted: bool = False) -> list[uuid.UUID]:
+    """Importiert Szenendateien und gibt die Szenen-IDs in Dateireihenfolge zurück.
 
-def import_scenes(session: Session, scene_paths: Iterable[Path]) -> list[models.Scene]:
-    imported: list[models.Scene] = []
-    for path in scene_paths:
-        scene_model = load_scene_yaml(path)
-        scene = upsert_scene(session, scene_model)
-        imported.append(scene)
+    Blockweise (``UPSERT_BATCH_SIZE`` Dateien): erst laden und validieren (ohne DB),
+    dann gesammelt schreiben – der Speicherbedarf bleibt durch die Blockgröße begrenzt.
+    """
+    paths = list(scene_paths)
+    imported: list[uuid.UUID] = []
+    for start in range(0, len(paths), UPSERT_BATCH_SIZE):
+        scene_models = load_scene_files(paths[start:start + UPSERT_BATCH_SIZE], trusted=trusted)
+        scene_ids = upsert_scenes(session, scene_models)
+        imported.extend(scene_ids[scene_model.id] for scene_model in scene_models)
     session.flush()
     return imported
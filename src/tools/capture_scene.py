@@ -1,9 +1,13 @@
 from __future__ import annotations
 
+import json
+import mmap
+import os
 import sys
-import sys
+from collections import deque
+from functools import lru_cache
 from pathlib import Path
-from typing import Any, Dict, List, Optional, Tuple
+from typing import Any, Callable, Dict, List, Optional, Tuple
 
 import numpy as np
 import typer
@@ -11,7 +15,13 @@ import yaml
 
 from src.db.session import session_scope
 from src.db.schemas import SceneModel, GhostBallModel
-from src.services.ingest import import_scenes, load_scene_yaml
+from src.services.ingest import extract_page_number, import_scenes, load_scene_yaml
+
+# libyaml-Bindings verwenden, falls verfügbar (deutlich schneller als reines Python)
+try:
+    from yaml import CSafeDumper as _SafeDumper
+except ImportError:  # pragma: no cover
+    from yaml import SafeDumper as _SafeDumper
 
 app = typer.Typer(help="Interactive tools for capturing and importing billiards scenes")
 
@@ -51,6 +61,7 @@ except ImportError:  # pragma: no cover
     HAS_CV2 = False
 
 import matplotlib.pyplot as plt  # noqa: E402
+from matplotlib.collections import LineCollection  # noqa: E402
 
 try:
     import select  # type: ignore[attr-defined]
@@ -67,63 +78,106 @@ class CaptureSession:
         plt.show(block=False)
         typer.echo("-- Toolbar nutzen (Zoom/Pan). Mit Enter bestätigen, wenn bereit --")
         input()
-        self._lines: Dict[str, list] = {}
+        self._traces: Dict[str, Tuple[LineCollection, Any]] = {}
         self._last_points: Dict[str, List[np.ndarray]] = {}
         self._start_points: Dict[str, np.ndarray] = {}
         self._last_key: Optional[str] = None
+        self._click_queue: deque[np.ndarray] = deque()
+        # Hintergrund ohne Spuren für Blitting; wird bei jedem vollen Neuzeichnen erneuert
+        self._background = None
+        # Spuren geändert, aber noch nicht gezeichnet (mehrere Änderungen → ein Blit)
+        self._dirty = False
+        self.fig.canvas.mpl_connect("draw_event", self._on_draw)
         self.fig.canvas.mpl_connect("key_press_event", self._on_key_press)
+        self.fig.canvas.mpl_connect("button_press_event", self._on_click)
 
     def _on_key_press(self, event) -> None:
         self._last_key = event.key
 
+    def _on_click(self, event) -> None:
+        # Nur Linksklicks ins Bild, nicht während Zoom/Pan der Toolbar
+        toolbar = self.fig.canvas.toolbar
+        if toolbar is not None and toolbar.mode:
+            return
+        if event.inaxes is not self.ax or event.button != 1 or event.xdata is None:
+            return
+        self._click_queue.append(np.array([event.xdata, event.ydata], dtype=float))
+
     def pop_key(self) -> Optional[str]:
         key = self._last_key
         self._last_key = None
         return key
 
-    def add_point_to_trace(self, ball: str, point: np.ndarray) -> None:
-        history = self._last_points.setdefault(ball, [])
-        history.append(point.copy())
-
-        if len(history) == 1:
-            start = self._start_points.get(ball)
-            artists: list = []
-            if start is not None:
-                line, = self.ax.plot([start[0], point[0]], [start[1], point[1]], c="red", linewidth=1.5)
-                artists.append(line)
-            scatter = self.ax.scatter(point[0], point[1], c="red", s=40)
-            artists.append(scatter)
-            self._lines.setdefault(ball, []).extend(artists)
+    def _on_draw(self, event) -> None:
+        self._background = self.fig.canvas.copy_from_bbox(self.fig.bbox)
+        self._draw_traces()
+        self._dirty = False
+
+    def flush(self) -> None:
+        """Zeichnet ausstehende Spur-Änderungen, bevor wieder auf Eingaben gewartet wird."""
+        if self._dirty:
+            self._dirty = False
+            self._blit()
+
+    def _draw_traces(self) -> None:
+        for artists in self._traces.values():
+            for artist in artists:
+                self.fig.draw_artist(artist)
+
+    def _blit(self) -> None:
+        """Zeichnet nur die Spuren neu, das Bild kommt aus dem gespeicherten Hintergrund."""
+        canvas = self.fig.canvas
+        if self._background is None or not canvas.supports_blit:
+            canvas.draw_idle()
+            return
+        canvas.restore_region(self._background)
+        self._draw_traces()
+        canvas.blit(self.fig.bbox)
+        canvas.flush_events()
+
+    def _trace_artists(self, ball: str) -> Tuple[LineCollection, Any]:
+        artists = self._traces.get(ball)
+        if artists is None:
+            # Ein Linien- und ein Punkt-Artist pro Ball, die bei jedem Klick nur aktualisiert werden
+            # animated: nicht Teil des gespeicherten Hintergrunds, nur per Blitting gezeichnet
+            lines = LineCollection([], colors="red", linewidths=1.5, animated=True)
+            self.ax.add_collection(lines, autolim=False)
+            markers = self.ax.scatter([], [], color="red", s=40, animated=True)
+            artists = (lines, markers)
+            self._traces[ball] = artists
+        return artists
+
+    def _update_trace(self, ball: str) -> None:
+        history = self._last_points.get(ball, [])
+        start = self._start_points.get(ball)
+        vertices = ([start] if start is not None and history else []) + history
+        lines, markers = self._trace_artists(ball)
+        if len(vertices) >= 2:
+            pts = np.asarray(vertices, dtype=float)
+            lines.set_segments(np.stack([pts[:-1], pts[1:]], axis=1))
         else:
-            prev = history[-2]
-            line, = self.ax.plot([prev[0], point[0]], [prev[1], point[1]], c="red", linewidth=1.5)
-            scatter = self.ax.scatter(point[0], point[1], c="red", s=40)
-            self._lines.setdefault(ball, []).extend([line, scatter])
-        plt.draw()
+            lines.set_segments([])
+        markers.set_offsets(np.asarray(history, dtype=float).reshape(-1, 2))
+        self._dirty = True
+
+    def add_point_to_trace(self, ball: str, point: np.ndarray) -> None:
+        self._last_points.setdefault(ball, []).append(point.copy())
+        self._update_trace(ball)
 
     def remove_last_point(self, ball: str) -> None:
         history = self._last_points.get(ball)
         if not history:
             return
         history.pop()
-        to_remove = self._lines.get(ball, [])
-        if to_remove:
-            artists = to_remove[-2:] if len(history) >= 1 else to_remove[-1:]
-            for artist in artists:
-                artist.remove()
-            self._lines[ball] = to_remove[: -len(artists)]
-        plt.draw()
+        self._update_trace(ball)
 
     def reset_trace(self, ball: str, start_point: Optional[List[float]] = None) -> None:
-        for artist in self._lines.get(ball, []):
-            artist.remove()
-        self._lines[ball] = []
         self._last_points[ball] = []
         if start_point is not None:
             self._start_points[ball] = np.array(start_point, dtype=float)
         elif ball in self._start_points:
             del self._start_points[ball]
-        plt.draw()
+        self._update_trace(ball)
 
     def wait_for_point_or_key(
         self,
@@ -137,15 +191,13 @@ class CaptureSession:
             if self._last_key is not None:
                 key = self.pop_key()
                 return "key", key
-            # Längerer Timeout, damit Klicks nicht verpasst werden
-            click = plt.ginput(1, timeout=1.0)
-            if click:
-                raw = np.array(click[0], dtype=float)
+            if self._click_queue:
+                raw = self._click_queue.popleft()
                 typer.secho(f"{prompt}: Pixel=({raw[0]:.1f}, {raw[1]:.1f})", fg=typer.colors.GREEN)
                 if refine_ball:
                     refined = _refine(self.image, raw, ball_name=ball_name)
                     # Prüfe, ob Korrektur übersprungen wurde (z.B. Verschiebung zu groß)
-                    if np.allclose(raw, refined, atol=0.1):
+                    if _close2(raw, refined, tol=0.1):
                         typer.secho(
                             f" → Originalposition verwendet (Korrektur übersprungen)",
                             fg=typer.colors.YELLOW,
@@ -168,7 +220,9 @@ class CaptureSession:
                         return "key", "q"
                     if lowered in {"u", "undo"}:
                         return "key", "backspace"
-            plt.pause(0.01)
+            self.flush()
+            # Ereignisschleife laufen lassen; Klicks/Tasten kommen über die Callbacks
+            plt.pause(0.05)
 
     def get_point(
         self,
@@ -179,7 +233,10 @@ class CaptureSession:
     ) -> Optional[np.ndarray]:
         self.ax.set_title(prompt)
         plt.draw()
+        self.flush()
         click = plt.ginput(1, timeout=0)
+        # Der ginput-Klick landet auch in der Klick-Queue und darf nicht erneut zählen
+        self._click_queue.clear()
         if not click:
             if allow_skip:
                 typer.echo("    → beendet.")
@@ -190,7 +247,7 @@ class CaptureSession:
         if refine_ball:
             refined = _refine(self.image, raw, ball_name=ball_name)
             # Prüfe, ob Korrektur übersprungen wurde (z.B. Verschiebung zu groß)
-            if np.allclose(raw, refined, atol=0.1):
+            if _close2(raw, refined, tol=0.1):
                 typer.secho(
                     f" → Originalposition verwendet (Korrektur übersprungen)",
                     fg=typer.colors.YELLOW,
@@ -218,38 +275,40 @@ def _compute_matrix(calib: np.ndarray, table_coords: Optional[np.ndarray] = None
     pixel = np.column_stack((calib, np.ones(3)))
     if table_coords is None:
         table_coords = np.array([[0.0, 0.0], [40.0, 0.0], [0.0, 80.0]])
-    mx, *_ = np.linalg.lstsq(pixel, table_coords[:, 0], rcond=None)
-    my, *_ = np.linalg.lstsq(pixel, table_coords[:, 1], rcond=None)
-    return np.vstack([mx, my])
+    # 3 Punkte, 3 Unbekannte je Achse: exakt lösbar, beide Achsen in einem Solve
+    try:
+        return np.linalg.solve(pixel, table_coords).T
+    except np.linalg.LinAlgError as exc:
+        raise typer.BadParameter(
+            "Kalibrierungspunkte liegen auf einer Geraden – bitte neu kalibrieren"
+        ) from exc
 
 
-def _extract_page_number(page: int | str | None) -> int | None:
-    """Extrahiert die Seitennummer aus einem page-Wert.
-    
-    Args:
-        page: Seitenzahl als Integer oder String (z.B. "270", "270 oben", "270 unten")
-    
-    Returns:
-        Seitennummer als Integer oder None
-    """
-    if page is None:
-        return None
-    if isinstance(page, int):
-        return page
-    # Extrahiere Zahl aus String (z.B. "270 oben" -> 270)
-    import re
-    match = re.search(r'\d+', str(page))
-    if match:
-        return int(match.group())
-    return None
+def _pixel_to_table_batch(matrix: np.ndarray, points: np.ndarray) -> np.ndarray:
+    """Transformiert N Pixelpunkte (Nx2) in einem Schritt in Tisch-Koordinaten (Nx2)."""
+    points = np.asarray(points, dtype=float).reshape(-1, 2)
+    return points @ matrix[:, :2].T + matrix[:, 2]
 
 
 def _pixel_to_table(matrix: np.ndarray, point: np.ndarray) -> tuple[float, float]:
-    vec = np.array([point[0], point[1], 1.0])
-    tx = matrix @ vec
+    tx = _pixel_to_table_batch(matrix, point)[0]
     return float(tx[0]), float(tx[1])
 
 
+def _pixel_to_table_fn(matrix: np.ndarray) -> Callable[[np.ndarray], Tuple[float, float]]:
+    """Liefert eine skalare Pixel→Tisch-Transformation mit fest ausgelesener Matrix.
+
+    Für einzelne Klicks ohne NumPy-Aufrufe pro Punkt (die Matrix ändert sich nach der Kalibrierung nicht).
+    """
+    (a, b, c), (d, e, f) = matrix.tolist()
+
+    def to_table(point: np.ndarray) -> Tuple[float, float]:
+        px, py = float(point[0]), float(point[1])
+        return a * px + b * py + c, d * px + e * py + f
+
+    return to_table
+
+
 def _clamp_to_table(table_coords: Tuple[float, float], table_size: Tuple[float, float] = (40.0, 80.0)) -> Tuple[float, float]:
     """Begrenzt Tisch-Koordinaten auf den gültigen Bereich (0..table_w, 0..table_h)."""
     x, y = table_coords
@@ -259,11 +318,38 @@ def _clamp_to_table(table_coords: Tuple[float, float], table_size: Tuple[float,
     return (x, y)
 
 
+# Diamantlinien, unabhängig von der Tischgröße
+_DIAMOND_LINES_X = (10.0, 20.0, 30.0)
+_DIAMOND_LINES_Y = (10.0, 20.0, 30.0, 40.0, 50.0, 60.0, 70.0)
+
+# Aggressiveres Snapping: Abstand kleiner 0.6 Diamonds wird gesnappt
+SNAP_THRESHOLD = 0.6
+
+
+@lru_cache(maxsize=8)
+def _snap_lines(table_size: Tuple[float, float]) -> Tuple[np.ndarray, np.ndarray]:
+    """Liefert alle Snaplinien (x, y) für eine Tischgröße."""
+    table_w, table_h = table_size
+    # Klein-Cadre: kleine Seite gedrittelt, CadreAbstand = Tischbreite/3 von unten und oben
+    cadre_abstand = table_w / 3.0
+    lines_x = np.array([0.0, *_DIAMOND_LINES_X, table_w / 3.0, 2.0 * table_w / 3.0])
+    lines_y = np.array([0.0, *_DIAMOND_LINES_Y, cadre_abstand, table_h - cadre_abstand])
+    return lines_x, lines_y
+
+
+def _snap_value(value: float, lines: np.ndarray) -> float:
+    diffs = np.abs(lines - value)
+    idx = int(diffs.argmin())
+    if diffs[idx] <= SNAP_THRESHOLD:
+        return float(lines[idx])
+    return value
+
+
 def _snap_to_grid(table_coords: Tuple[float, float], table_size: Tuple[float, float] = (40.0, 80.0)) -> Tuple[float, float]:
     """Snappt Tisch-Koordinaten auf markante Linien, wenn sie innerhalb von 0.6 Diamonds liegen.
     
     Koordinatensystem: (0,0) = linke untere Ecke, x = horizontal, y = vertikal
-    Snaplinien:
+    Snaplinien (je Achse wird die nächstgelegene Linie genommen):
     - Ursprung (0, 0)
     - Diamantlinien lange Seite (y-Richtung, parallel zur kurzen Bande): 10, 20, 30, 40, 50, 60, 70
     - Diamantlinien kurze Seite (x-Richtung, parallel zur langen Bande): 10, 20, 30
@@ -271,57 +357,25 @@ def _snap_to_grid(table_coords: Tuple[float, float], table_size: Tuple[float, fl
     - Klein-Cadre horizontal (y-Koordinaten, parallel zur kurzen Bande): CadreAbstand = Tischbreite/3 von unten und oben
     """
     x, y = table_coords
-    table_w, table_h = table_size
-    
-    # Aggressiveres Snapping: Abstand kleiner 0.6 Diamonds wird gesnappt
-    snap_threshold = 0.6
-    
-    # Snapping auf Ursprung (0, 0)
-    if abs(x) <= snap_threshold:
-        x = 0.0
-    if abs(y) <= snap_threshold:
-        y = 0.0
-    
-    # Diamantlinien lange Seite (y-Richtung): 10, 20, 30, 40, 50, 60, 70
-    diamond_lines_y = [10.0, 20.0, 30.0, 40.0, 50.0, 60.0, 70.0]
-    for line_y in diamond_lines_y:
-        if abs(y - line_y) <= snap_threshold:
-            y = line_y
-            break
-    
-    # Diamantlinien kurze Seite (x-Richtung): 10, 20, 30
-    diamond_lines_x = [10.0, 20.0, 30.0]
-    for line_x in diamond_lines_x:
-        if abs(x - line_x) <= snap_threshold:
-            x = line_x
-            break
-    
-    # Klein-Cadre horizontal (x-Richtung): Kleine Seite wird gedrittelt
-    # Linien bei 1/3 und 2/3 der Tischbreite
-    klein_cadre_x = [table_w / 3.0, 2.0 * table_w / 3.0]
-    for line_x in klein_cadre_x:
-        if abs(x - line_x) <= snap_threshold:
-            x = line_x
-            break
-    
-    # Klein-Cadre vertikal (y-Richtung): CadreAbstand = Tischbreite/3
-    # Von oben im CadreAbstand eine Linie, von unten im CadreAbstand eine Linie
-    cadre_abstand = table_w / 3.0
-    klein_cadre_y = [cadre_abstand, table_h - cadre_abstand]
-    for line_y in klein_cadre_y:
-        if abs(y - line_y) <= snap_threshold:
-            y = line_y
-            break
-    
-    return (x, y)
+    lines_x, lines_y = _snap_lines((float(table_size[0]), float(table_size[1])))
+    return (_snap_value(x, lines_x), _snap_value(y, lines_y))
+
+
+def _close2(a, b, tol: float = 0.01) -> bool:
+    """Vergleicht zwei 2D-Punkte komponentenweise (skalarer Ersatz für np.allclose)."""
+    return abs(a[0] - b[0]) <= tol and abs(a[1] - b[1]) <= tol
 
 
 def _round_pair(coords: Tuple[float, float]) -> List[float]:
     return [round(coords[0], 2), round(coords[1], 2)]
 
 
-DigitTemplateKey = Tuple[int, bool]
-DIGIT_TEMPLATE_CACHE: Dict[DigitTemplateKey, np.ndarray] = {}
+# Nur normale Templates: die invertierte Variante deckt _refine_with_digit über das negierte Match-Ergebnis ab
+DIGIT_TEMPLATE_CACHE: Dict[int, np.ndarray] = {}
+
+# Vorgerenderte Ziffern-Templates (erzeugt mit scripts/build_digit_templates.py)
+DIGIT_TEMPLATE_FILE = Path(__file__).with_name("digit_templates.npz")
+_digit_templates_loaded = False
 
 
 def _ball_digit(ball_name: Optional[str]) -> Optional[int]:
@@ -335,12 +389,40 @@ def _ball_digit(ball_name: Optional[str]) -> Optional[int]:
     return None
 
 
-def _get_digit_template(digit: int, inverted: bool) -> np.ndarray:
-    key: DigitTemplateKey = (digit, inverted)
-    cached = DIGIT_TEMPLATE_CACHE.get(key)
+def _digit_template_name(digit: int) -> str:
+    return str(digit)
+
+
+def _load_digit_templates() -> None:
+    """Füllt DIGIT_TEMPLATE_CACHE einmalig aus der .npz-Datei, falls vorhanden."""
+    global _digit_templates_loaded
+    if _digit_templates_loaded:
+        return
+    _digit_templates_loaded = True
+    if not DIGIT_TEMPLATE_FILE.exists():
+        return
+    with np.load(DIGIT_TEMPLATE_FILE) as data:
+        for digit in range(10):
+            name = _digit_template_name(digit)
+            if name in data:
+                DIGIT_TEMPLATE_CACHE.setdefault(digit, data[name])
+
+
+def _get_digit_template(digit: int) -> np.ndarray:
+    cached = DIGIT_TEMPLATE_CACHE.get(digit)
+    if cached is not None:
+        return cached
+    _load_digit_templates()
+    cached = DIGIT_TEMPLATE_CACHE.get(digit)
     if cached is not None:
         return cached
+    # Fallback: Template zur Laufzeit rendern
+    template = _render_digit_template(digit, False)
+    DIGIT_TEMPLATE_CACHE[digit] = template
+    return template
+
 
+def _render_digit_template(digit: int, inverted: bool) -> np.ndarray:
     size = 48
     canvas = np.full((size, size), 0.6 if not inverted else 0.4, dtype=np.float32)
     face_color = 0.95 if not inverted else 0.05
@@ -367,9 +449,20 @@ def _get_digit_template(digit: int, inverted: bool) -> np.ndarray:
         thickness,
         lineType=cv2.LINE_AA,
     )
-    template = cv2.GaussianBlur(canvas, (3, 3), 0)
-    DIGIT_TEMPLATE_CACHE[key] = template
-    return template
+    return cv2.GaussianBlur(canvas, (3, 3), 0)
+
+
+# Wiederverwendete float32-Arbeitspuffer für das Template-Matching, je Zweck und Form
+_SCRATCH_BUFFERS: Dict[Tuple[str, Tuple[int, int]], np.ndarray] = {}
+
+
+def _scratch_buffer(name: str, shape: Tuple[int, int]) -> np.ndarray:
+    """Liefert einen gecachten float32-Puffer; Inhalt ist beim Abruf undefiniert."""
+    key = (name, shape)
+    buf = _SCRATCH_BUFFERS.get(key)
+    if buf is None:
+        buf = _SCRATCH_BUFFERS[key] = np.empty(shape, dtype=np.float32)
+    return buf
 
 
 def _refine_with_digit(gray_patch: np.ndarray, x0: int, y0: int, ball_name: str) -> Optional[np.ndarray]:
@@ -378,26 +471,29 @@ def _refine_with_digit(gray_patch: np.ndarray, x0: int, y0: int, ball_name: str)
     digit = _ball_digit(ball_name)
     if digit is None:
         return None
-    patch = gray_patch.astype(np.float32)
-    if patch.size == 0:
+    if gray_patch.size == 0:
         return None
-    patch_norm = cv2.normalize(patch, None, 0.0, 1.0, cv2.NORM_MINMAX)
-
-    best_score = -1.0
-    best_center: Optional[Tuple[float, float]] = None
-    for inverted in (False, True):
-        template = _get_digit_template(digit, inverted)
-        th, tw = template.shape
-        if patch_norm.shape[0] < th or patch_norm.shape[1] < tw:
-            continue
-        result = cv2.matchTemplate(patch_norm, template, cv2.TM_CCOEFF_NORMED)
-        _, max_val, _, max_loc = cv2.minMaxLoc(result)
-        if max_val > best_score:
-            best_score = max_val
-            best_center = (max_loc[0] + tw / 2, max_loc[1] + th / 2)
-
-    if best_center is not None and best_score >= 0.4:
-        return np.array([x0 + best_center[0], y0 + best_center[1]])
+
+    template = _get_digit_template(digit)
+    th, tw = template.shape
+    ph, pw = gray_patch.shape[:2]
+    if ph < th or pw < tw:
+        return None
+    patch = _scratch_buffer("patch", (ph, pw))
+    np.copyto(patch, gray_patch)
+    # Das invertierte Template ist (bis auf Rundung) 1 - Template; TM_CCOEFF_NORMED
+    # liefert dafür exakt das negierte Ergebnis. Ein Match deckt daher beide
+    # Varianten ab: Maximum = normal, -Minimum = invertiert. TM_CCOEFF_NORMED ist
+    # invariant gegen Helligkeit/Kontrast, der Patch braucht keine Normierung.
+    result = _scratch_buffer("match", (ph - th + 1, pw - tw + 1))
+    cv2.matchTemplate(patch, template, cv2.TM_CCOEFF_NORMED, result=result)
+    min_val, max_val, min_loc, max_loc = cv2.minMaxLoc(result)
+    best_score, best_loc = max_val, max_loc
+    if -min_val > best_score:
+        best_score, best_loc = -min_val, min_loc
+
+    if best_score >= 0.4:
+        return np.array([x0 + best_loc[0] + tw / 2, y0 + best_loc[1] + th / 2])
     return None
 
 
@@ -412,6 +508,7 @@ def _capture_new_points(
         "  Punkte nacheinander anklicken. Enter (Plot oder Terminal) beendet, Backspace/U undo, q = Abbruch."
     )
     session._last_points.setdefault(ball_name, [])
+    to_table = _pixel_to_table_fn(matrix)
     created: List[Dict[str, Any]] = []
     idx = start_index
     aborted = False
@@ -443,12 +540,12 @@ def _capture_new_points(
             continue
 
         # Transformiere zu Tisch-Koordinaten, begrenze auf Tischbereich (kein Snapping für Trajektorie-Punkte)
-        table_coords = _pixel_to_table(matrix, point)
+        table_coords = to_table(point)
         clamped_coords = _clamp_to_table(table_coords, table_size)
         coords = _round_pair(clamped_coords)
         
         # Prüfe, ob begrenzt wurde
-        if not np.allclose(table_coords, clamped_coords, atol=0.01):
+        if not _close2(table_coords, clamped_coords):
             typer.secho(f"      → auf Tischbereich begrenzt: {coords}", fg=typer.colors.YELLOW)
         
         session.add_point_to_trace(ball_name, point)
@@ -465,6 +562,30 @@ def _capture_new_points(
     return created, aborted
 
 
+def _load_image(image_path: Path) -> np.ndarray:
+    """Lädt ein Tischbild als uint8-RGB-Array (H x W x 3)."""
+    if HAS_CV2:
+        # Datei per mmap direkt aus dem Page-Cache dekodieren, ohne Kopie in ein bytes-Objekt
+        with open(image_path, "rb") as fh:
+            if os.fstat(fh.fileno()).st_size > 0:
+                with mmap.mmap(fh.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                    image = cv2.imdecode(np.frombuffer(mm, dtype=np.uint8), cv2.IMREAD_COLOR)
+                if image is not None:
+                    return cv2.cvtColor(image, cv2.COLOR_BGR2RGB)
+    image = np.asarray(plt.imread(image_path))
+    if image.ndim == 2:
+        image = np.stack([image] * 3, axis=-1)
+    image = image[..., :3]
+    if image.dtype != np.uint8:
+        # PNGs liefert plt.imread als float in [0, 1]
+        image = (np.clip(image, 0.0, 1.0) * 255).round().astype(np.uint8)
+    return image
+
+
+# Mindest-Standardabweichung der Grauwerte, ab der im Patch nach Kreisen/Ziffern gesucht wird
+MIN_PATCH_STD = 10.0
+
+
 def _refine(image: np.ndarray, point: np.ndarray, radius: int = 35, ball_name: Optional[str] = None) -> np.ndarray:
     x, y = map(int, point)
     h, w = image.shape[:2]
@@ -475,11 +596,21 @@ def _refine(image: np.ndarray, point: np.ndarray, radius: int = 35, ball_name: O
     
     x0, x1 = max(x - radius, 0), min(x + radius, w)
     y0, y1 = max(y - radius, 0), min(y + radius, h)
-    patch = image[y0:y1, x0:x1]
+    # Ausschnitt zusammenhängend kopieren (eine Zeile der Bildbreite liegt zwischen den Patch-Zeilen),
+    # damit cvtColor/HoughCircles ohne interne Konvertierung auf dem Puffer arbeiten
+    patch = np.ascontiguousarray(image[y0:y1, x0:x1])
     if patch.size == 0:
         return point
-    gray = patch.mean(axis=2).astype(np.uint8)
+    if patch.dtype != np.uint8:
+        # Float-Bilder (plt.imread liefert PNGs in [0, 1]) für cvtColor/HoughCircles nach uint8 bringen
+        patch = (np.clip(patch, 0.0, 1.0) * 255).astype(np.uint8)
     if HAS_CV2:
+        gray = cv2.cvtColor(patch, cv2.COLOR_RGB2GRAY)
+    else:
+        gray = patch.mean(axis=2).astype(np.uint8)
+    # Flache Patches (z.B. Fehlklick auf leeres Tuch) haben keine Ballkanten:
+    # HoughCircles und Template-Matching überspringen
+    if HAS_CV2 and gray.std() >= MIN_PATCH_STD:
         blur = cv2.medianBlur(gray, 5)
         circles = cv2.HoughCircles(
             blur,
@@ -509,10 +640,20 @@ def _refine(image: np.ndarray, point: np.ndarray, radius: int = 35, ball_name: O
                 return digit_match
     thresh = gray.mean()
     mask = gray < thresh
-    coords = np.column_stack(np.nonzero(mask))
-    if coords.size == 0:
-        return point
-    cy, cx = coords.mean(axis=0)
+    if HAS_CV2:
+        # Schwerpunkt der dunklen Pixel über Bildmomente (ohne Nx2-Indexarray)
+        moments = cv2.moments(mask.view(np.uint8), binaryImage=True)
+        if moments["m00"] == 0:
+            return point
+        cx = moments["m10"] / moments["m00"]
+        cy = moments["m01"] / moments["m00"]
+    else:
+        total = np.count_nonzero(mask)
+        if total == 0:
+            return point
+        # Schwerpunkt der dunklen Pixel über Zeilen-/Spaltensummen (ohne Nx2-Indexarray)
+        cy = mask.sum(axis=1) @ np.arange(mask.shape[0]) / total
+        cx = mask.sum(axis=0) @ np.arange(mask.shape[1]) / total
     refined_point = np.array([x0 + cx, y0 + cy])
     
     # Prüfe Verschiebung: Nur akzeptieren, wenn weniger als 1/4 Ballbreite
@@ -539,7 +680,7 @@ def capture(
             raise typer.BadParameter("Kein Bildpfad angegeben und keine Seitenzahl in YAML vorhanden")
         
         # Extrahiere Seitennummer (kann String wie "270 oben" sein)
-        page_num = _extract_page_number(scene_model.source.page)
+        page_num = extract_page_number(scene_model.source.page)
         if page_num is None:
             raise typer.BadParameter(f"Konnte Seitennummer nicht aus '{scene_model.source.page}' extrahieren")
         
@@ -555,7 +696,7 @@ def capture(
             raise typer.BadParameter(f"Bilddatei nicht gefunden: {image_path}")
         typer.echo(f"Bild automatisch aus Seitenzahl abgeleitet: {image_path} (Seite: {scene_model.source.page})")
     
-    image = np.array(plt.imread(image_path))
+    image = _load_image(image_path)
 
     session = CaptureSession(image)
     try:
@@ -608,9 +749,11 @@ def capture(
         table_size = (scene_model.table.size_units[0], scene_model.table.size_units[1])
         
         updates: dict[str, tuple[float, float]] = {}
-        for name in ball_order + ["GHOST"]:
-            point = ball_points[name]
-            table_coords = _pixel_to_table(matrix, point)
+        update_names = ball_order + ["GHOST"]
+        # Alle Bälle in einem Aufruf transformieren
+        table_points = _pixel_to_table_batch(matrix, np.array([ball_points[name] for name in update_names]))
+        for name, table_point in zip(update_names, table_points):
+            table_coords = (float(table_point[0]), float(table_point[1]))
             clamped_coords = _clamp_to_table(table_coords, table_size)
             
             # Ghost Ball wird nicht gesnappt - verwende Originalposition
@@ -622,10 +765,10 @@ def capture(
             updates[name] = (round(final_coords[0], 2), round(final_coords[1], 2))
             
             # Prüfe, ob begrenzt wurde
-            if not np.allclose(table_coords, clamped_coords, atol=0.01):
+            if not _close2(table_coords, clamped_coords):
                 typer.secho(f"{name}: Koordinaten auf Tischbereich begrenzt ({table_coords[0]:.2f}, {table_coords[1]:.2f} → {clamped_coords[0]:.2f}, {clamped_coords[1]:.2f})", fg=typer.colors.YELLOW)
             # Prüfe, ob gesnappt wurde (nur für echte Bälle)
-            elif name != "GHOST" and not np.allclose(clamped_coords, final_coords, atol=0.01):
+            elif name != "GHOST" and not _close2(clamped_coords, final_coords):
                 typer.secho(f"{name}: Tisch-Koordinaten {final_coords[0]:.2f}, {final_coords[1]:.2f} (gesnappt)", fg=typer.colors.MAGENTA)
             else:
                 typer.secho(f"{name}: Tisch-Koordinaten {final_coords[0]:.2f}, {final_coords[1]:.2f}", fg=typer.colors.CYAN)
@@ -671,16 +814,21 @@ def capture(
     scene_model = SceneModel.model_validate(scene_dict)
 
     with yaml_path.open("w") as fh:
-        yaml.safe_dump(
-            {"scene": scene_model.model_dump(mode="json")},
-            fh,
-            allow_unicode=True,
-            sort_keys=False,
-        )
+        if yaml_path.suffix == ".json":
+            json.dump({"scene": scene_model.model_dump(mode="json")}, fh, ensure_ascii=False, indent=2)
+        else:
+            yaml.dump(
+                {"scene": scene_model.model_dump(mode="json")},
+                fh,
+                Dumper=_SafeDumper,
+                allow_unicode=True,
+                sort_keys=False,
+            )
     typer.secho(f"YAML aktualisiert: {yaml_path}", fg=typer.colors.GREEN)
 
     with session_scope() as session:
-        import_scenes(session, [yaml_path])
+        # Datei wurde eben aus einem validierten SceneModel geschrieben
+        import_scenes(session, [yaml_path], trusted=True)
         typer.secho("Szenendatenbank aktualisiert.", fg=typer.colors.GREEN)
 
     typer.secho("Capture fertig.", fg=typer.colors.BRIGHT_WHITE)
@@ -1,45 +1,182 @@
 #!/usr/bin/env python3
 """Visualisiert eine Szenen-YAML mit Trajektorien auf dem zugehörigen Bild."""
 
+from __future__ import annotations
+
+import os
+from functools import lru_cache
 from pathlib import Path
-from typing import Dict, List, Tuple, Literal, Optional
+from types import MappingProxyType
+from typing import TYPE_CHECKING, Dict, List, Tuple, Literal, Optional
 
-import matplotlib.pyplot as plt
-import matplotlib.patches as mpatches
-import numpy as np
 import typer
 
-from src.services.ingest import load_scene_yaml
+from src.services.ingest import extract_page_number, load_scene_yaml
 from src.db.models import TableVariant
 
+# numpy, matplotlib und PIL werden erst in den Funktionen importiert,
+# damit z.B. --help ohne deren Importzeit auskommt
+if TYPE_CHECKING:
+    import numpy as np
+
 app = typer.Typer(help="Visualisiert Szenen-YAMLs mit Trajektorien")
 
+# Farben für die Bälle (visualize) und ihre Trajektorien
+_BALL_COLORS = MappingProxyType({
+    'B1': 'white',
+    'B2': 'yellow',
+    'B3': 'red',
+})
+_TRAJECTORY_COLORS = MappingProxyType({
+    'B1': 'red',
+    'B2': 'blue',
+    'B3': 'green',
+})
 
-def _table_to_pixel_simple(table_point: Tuple[float, float], image_shape: Tuple[int, int], 
-                           table_size: Tuple[float, float] = (40.0, 80.0)) -> Tuple[float, float]:
-    """Vereinfachte Transformation: Tisch-Koordinaten zu Pixel (ohne Kalibrierung).
+# draw(): (facecolor, edgecolor, textcolor) je Ball; B1 und B2 weiß mit schwarzem Rand, B3 schwarz gefüllt
+_DRAW_BALL_STYLES = MappingProxyType({
+    'B1': ('white', 'black', 'black'),
+    'B2': ('white', 'black', 'black'),
+    'B3': ('black', 'black', 'white'),
+})
+_DRAW_GHOST_STYLE = ('none', 'gray', 'gray')
+
+# Maximal im Infokasten aufgelistete Trajektorienpunkte
+_MAX_INFO_POINTS = 15
+
+# visualize(): Figur so groß wie das Quellbild bei dieser DPI
+_RENDER_DPI = 100
+
+# Von _pyplot() gesetzt, bevor gezeichnet wird: Agg fasst sichtbar zusammenfallende Pfadpunkte zusammen
+# und zeichnet lange Pfade in Teilstücken
+_RC_PARAMS = MappingProxyType({
+    'path.simplify': True,
+    'path.simplify_threshold': 1.0,
+    'agg.path.chunksize': 10000,
+    'figure.autolayout': False,
+})
+
+# Schnelle zlib-Stufe für PNG-Ausgaben: etwas größere Dateien, deutlich kürzeres Speichern
+_PNG_SAVE_KWARGS = MappingProxyType({'compress_level': 1, 'optimize': False})
+
+# draw --high-dpi
+HIGH_DPI = 150
+
+# Hintergrund der Punktnummern an Trajektorien (für alle Labels gemeinsam)
+_LABEL_BBOX = dict(boxstyle='round,pad=0.3', facecolor='white', alpha=0.7)
+
+# Ab so vielen Punktnummern ohne Hintergrundkasten (je Kasten ein zusätzlicher Patch beim Rendern)
+_MAX_BOXED_LABELS = 50
+
+
+def _table_to_pixel_batch(points: np.ndarray, image_shape: Tuple[int, int],
+                          table_size: Tuple[float, float] = (40.0, 80.0),
+                          out: Optional[np.ndarray] = None) -> np.ndarray:
+    """Vereinfachte Transformation für N Tischpunkte (Nx2) zu Pixeln (Nx2), ohne Kalibrierung.
     
     Nimmt an, dass das Bild den gesamten Tisch zeigt und die Koordinaten relativ sind.
     Dies ist nur eine Näherung für die Visualisierung.
+    Mit ``out`` (float-Array Nx2, darf ``points`` selbst sein) wird ohne neue Allokation geschrieben.
     """
-    tx, ty = table_point
+    import numpy as np
+    
     img_h, img_w = image_shape[:2]
     table_w, table_h = table_size
+    points = np.asarray(points, dtype=float).reshape(-1, 2)
     
     # Einfache lineare Skalierung (Annahme: Bild zeigt gesamten Tisch)
     # Ursprung ist bottom_left, also y wird invertiert
-    px = (tx / table_w) * img_w
-    py = img_h - (ty / table_h) * img_h  # y invertiert wegen bottom_left origin
+    # Skalierungsfaktoren einmal berechnen, pro Punkt bleibt Multiplikation (+ Subtraktion für y)
+    scale = np.array([img_w / table_w, -img_h / table_h])
+    pixels = np.multiply(points, scale, out=out)
+    pixels[:, 1] += img_h  # y invertiert wegen bottom_left origin
     
+    return pixels
+
+
+def _table_to_pixel_simple(table_point: Tuple[float, float], image_shape: Tuple[int, int], 
+                           table_size: Tuple[float, float] = (40.0, 80.0)) -> Tuple[float, float]:
+    """Wie _table_to_pixel_batch, für einen einzelnen Punkt."""
+    px, py = _table_to_pixel_batch(table_point, image_shape, table_size)[0]
     return float(px), float(py)
 
 
+def _pyplot(headless: bool):
+    """Importiert pyplot erst beim Zeichnen; bei reiner Dateiausgabe mit Agg-Backend (ohne GUI-Start)."""
+    import matplotlib
+    if headless:
+        matplotlib.use('Agg', force=True)
+    matplotlib.rcParams.update(_RC_PARAMS)
+    import matplotlib.pyplot as plt
+    return plt
+
+
+def _output_is_current(output_path: Optional[Path], yaml_path: Path, force: bool) -> bool:
+    """True, wenn ``output_path`` existiert und nicht älter als die Szenen-YAML ist (dann nicht neu zeichnen)."""
+    if force or output_path is None:
+        return False
+    try:
+        is_current = output_path.stat().st_mtime >= yaml_path.stat().st_mtime
+    except FileNotFoundError:
+        return False
+    if is_current:
+        typer.echo(f"Aktuell: {output_path} (--force zum Neuzeichnen)")
+    return is_current
+
+
+@lru_cache(maxsize=1)
+def _label_font():
+    """Gemeinsame FontProperties (8 pt, fett) für Ball- und Punktbeschriftungen in visualize()."""
+    from matplotlib.font_manager import FontProperties
+    return FontProperties(size=8, weight='bold')
+
+
+@lru_cache(maxsize=32)
+def _load_image_cached(image_path: str, mtime: float) -> np.ndarray:
+    """Lädt ein Hintergrundbild; dekodierte Pixel werden als .npy neben dem PNG abgelegt.
+    
+    ``mtime`` (Änderungszeit des PNG) ist Teil des Cache-Schlüssels, damit ein geändertes
+    Bild im selben Prozess neu geladen wird. Ist die .npy-Datei neuer als das PNG, wird sie
+    per mmap geladen statt das PNG erneut zu dekodieren.
+    """
+    import numpy as np
+    from PIL import Image
+    
+    png_path = Path(image_path)
+    npy_path = png_path.with_suffix('.npy')
+    if npy_path.exists() and npy_path.stat().st_mtime >= mtime:
+        try:
+            return np.load(npy_path, mmap_mode='r')
+        except (OSError, ValueError):
+            pass  # Abgeschnittene/beschädigte .npy: PNG neu dekodieren und Cache ersetzen
+    # PIL direkt (kommt mit matplotlib): uint8-RGB statt float-RGBA aus plt.imread
+    with Image.open(png_path) as img:
+        image = np.asarray(img.convert('RGB'))
+    # Erst in eine temporäre Datei im selben Verzeichnis schreiben und dann atomar ersetzen,
+    # damit ein abgebrochener Lauf keine halbe .npy hinterlässt
+    tmp_path = npy_path.with_name(f"{npy_path.name}.{os.getpid()}.tmp")
+    try:
+        with open(tmp_path, 'wb') as fh:
+            np.save(fh, image)
+        os.replace(tmp_path, npy_path)
+    except OSError:
+        # Cache ist optional (z.B. schreibgeschütztes Datenverzeichnis)
+        tmp_path.unlink(missing_ok=True)
+    return image
+
+
 @app.command()
 def visualize(
     yaml_path: Path = typer.Argument(..., help="Pfad zur Szenen-YAML-Datei"),
     output_path: Path = typer.Option(None, "--output", "-o", help="Ausgabepfad für das Bild (optional)"),
+    validate_only: bool = typer.Option(False, "--validate-only", help="Nur Szene und Positionen prüfen, nichts zeichnen"),
+    force: bool = typer.Option(False, "--force", help="Bild auch dann neu zeichnen, wenn es neuer als die YAML ist"),
 ) -> None:
     """Visualisiert eine Szenen-YAML mit Trajektorien auf dem zugehörigen Bild."""
+    import numpy as np
+    
+    if not validate_only and _output_is_current(output_path, yaml_path, force):
+        return
     
     scene_model = load_scene_yaml(yaml_path)
     
@@ -48,8 +185,7 @@ def visualize(
         raise typer.BadParameter("Keine Seitenzahl in YAML vorhanden")
     
     # Extrahiere Seitennummer (kann String wie "270 oben" sein)
-    from src.tools.capture_scene import _extract_page_number
-    page_num = _extract_page_number(scene_model.source.page)
+    page_num = extract_page_number(scene_model.source.page)
     if page_num is None:
         raise typer.BadParameter(f"Konnte Seitennummer nicht aus '{scene_model.source.page}' extrahieren")
     
@@ -64,115 +200,175 @@ def visualize(
     if not image_path.exists():
         raise typer.BadParameter(f"Bilddatei nicht gefunden: {image_path}")
     
-    image = np.array(plt.imread(image_path))
-    
-    # Erstelle Plot
-    fig, ax = plt.subplots(figsize=(12, 16))
-    ax.imshow(image)
-    ax.set_title(f"{scene_model.id}: {scene_model.title}", fontsize=14, fontweight='bold')
-    
     # Für die Transformation brauchen wir eine Kalibrierungsmatrix
     # Da wir die nicht haben, plotten wir direkt in Pixel-Koordinaten
     # Wir müssen die Tisch-Koordinaten zu Pixel transformieren
     # Dafür brauchen wir die Kalibrierung - aber die haben wir nicht gespeichert
     # Alternative: Wir zeigen die Koordinaten als Text an und plotten relativ
     
-    # Farben für die Bälle
-    ball_colors = {
-        'B1': 'white',
-        'B2': 'yellow',
-        'B3': 'red',
-    }
-    
     table_size = (scene_model.table.size_units[0], scene_model.table.size_units[1])
     
-    # Zeichne Ball-Positionen
+    # Alle Tischpunkte (Bälle, Ghost Ball, Trajektorien) sammeln und in einem Schritt transformieren
+    ball_names = list(scene_model.balls)
+    table_points = [scene_model.balls[name].position for name in ball_names]
+    ghost_index = None
+    if scene_model.ghost_ball:
+        ghost_index = len(table_points)
+        table_points.append(scene_model.ghost_ball.position)
+    segment_ranges: Dict[str, slice] = {}
+    for ball_name, segments in scene_model.trajectory.items():
+        segment_ranges[ball_name] = slice(len(table_points), len(table_points) + len(segments))
+        table_points.extend(segment.point for segment in segments)
+    # reshape: auch eine Szene ohne Bälle und Punkte liefert ein (0, 2)-Array für out=
+    table_points = np.asarray(table_points, dtype=float).reshape(-1, 2)
+    
+    if validate_only:
+        # Nur den PNG-Header lesen, kein Dekodieren und kein Zeichnen
+        from PIL import Image
+        with Image.open(image_path) as img:
+            img_w, img_h = img.size
+        pixel_points = _table_to_pixel_batch(table_points, (img_h, img_w), table_size)
+        outside = ((pixel_points < 0) | (pixel_points > (img_w, img_h))).any(axis=1)
+        if outside.any():
+            typer.secho(
+                f"{scene_model.id}: {int(outside.sum())} von {len(pixel_points)} Positionen außerhalb des Bildes",
+                fg=typer.colors.RED,
+            )
+            raise typer.Exit(code=1)
+        typer.echo("OK")
+        return
+    
+    import matplotlib.patches as mpatches
+    from matplotlib.collections import LineCollection, PatchCollection
+    from matplotlib.lines import Line2D
+    
+    plt = _pyplot(headless=output_path is not None)
+    image = _load_image_cached(str(image_path), image_path.stat().st_mtime)
+    
+    # Erstelle Plot: Figurgröße in Pixeln entspricht der Bildauflösung (kein Hochrastern über die Quelle hinaus)
+    img_h, img_w = image.shape[:2]
+    fig, ax = plt.subplots(figsize=(img_w / _RENDER_DPI, img_h / _RENDER_DPI), dpi=_RENDER_DPI)
+    ax.imshow(image)
+    ax.set_title(f"{scene_model.id}: {scene_model.title}", fontsize=14, fontweight='bold')
+    
+    # Tischpunkte werden danach nicht mehr gebraucht: direkt im selben Array transformieren
+    pixel_points = _table_to_pixel_batch(table_points, image.shape, table_size, out=table_points)
+    ball_pixels = {name: pixel_points[i] for i, name in enumerate(ball_names)}
+    
+    # Alle Ballkreise als eine Collection; Ghost Ball zuerst, damit er unter den Bällen liegt
+    circles, facecolors, edgecolors, linestyles = [], [], [], []
+    if scene_model.ghost_ball:
+        circles.append(mpatches.Circle(tuple(pixel_points[ghost_index]), 15))
+        facecolors.append('none')
+        edgecolors.append('gray')
+        linestyles.append('--')
+    for ball_name in ball_names:
+        color_name = _BALL_COLORS.get(ball_name, 'gray')
+        circles.append(mpatches.Circle(tuple(ball_pixels[ball_name]), 15))
+        facecolors.append(color_name)
+        edgecolors.append('black' if color_name == 'white' else 'white')
+        linestyles.append('-')
+    ball_patches = PatchCollection(
+        circles, facecolors=facecolors, edgecolors=edgecolors,
+        linewidths=2, linestyles=linestyles, zorder=10,
+    )
+    # Wie add_patch: Datengrenzen erweitern, ohne den Bildausschnitt selbst umzuskalieren
+    ax.add_collection(ball_patches, autolim=False)
+    ax.update_datalim(ball_patches.get_datalim(ax.transData))
+    
+    # Beschrifte Ball-Positionen
+    label_font = _label_font()
     ball_info = []
     for ball_name, ball_data in scene_model.balls.items():
         x, y = ball_data.position
-        color_name = ball_colors.get(ball_name, 'gray')
-        px, py = _table_to_pixel_simple((x, y), image.shape, table_size)
-        
-        # Zeichne Ball
-        circle_color = 'white' if color_name == 'white' else color_name
-        edge_color = 'black' if color_name == 'white' else 'white'
-        circle = plt.Circle((px, py), 15, color=circle_color, ec=edge_color, lw=2, zorder=10)
-        ax.add_patch(circle)
-        ax.text(px, py, ball_name, ha='center', va='center', fontsize=8, fontweight='bold', zorder=11)
+        px, py = ball_pixels[ball_name]
+        ax.text(px, py, ball_name, ha='center', va='center', fontproperties=label_font, zorder=11)
         
         ball_info.append(f"{ball_name}: ({x:.2f}, {y:.2f})")
     
-    # Zeichne Ghost Ball
+    # Beschrifte Ghost Ball
     if scene_model.ghost_ball:
         gx, gy = scene_model.ghost_ball.position
-        gpx, gpy = _table_to_pixel_simple((gx, gy), image.shape, table_size)
-        circle = plt.Circle((gpx, gpy), 15, color='none', ec='gray', lw=2, linestyle='--', zorder=9)
-        ax.add_patch(circle)
+        gpx, gpy = pixel_points[ghost_index]
         ax.text(gpx, gpy, 'G', ha='center', va='center', fontsize=8, color='gray', zorder=10)
         ball_info.append(f"GHOST: ({gx:.2f}, {gy:.2f})")
     
     # Zeichne Trajektorien
     trajectory_info = []
-    trajectory_colors = {
-        'B1': 'red',
-        'B2': 'blue', 
-        'B3': 'green',
-    }
+    trajectory_total = 0
+    trajectory_lines, line_colors, legend_handles = [], [], []
+    point_label_count = sum(len(segments) for segments in scene_model.trajectory.values())
+    label_bbox = _LABEL_BBOX if point_label_count <= _MAX_BOXED_LABELS else None
     
     for ball_name, segments in scene_model.trajectory.items():
         if not segments:
             continue
         
-        color = trajectory_colors.get(ball_name, 'orange')
-        points_px = []
+        color = _TRAJECTORY_COLORS.get(ball_name, 'orange')
+        segment_pixels = pixel_points[segment_ranges[ball_name]]
         
-        # Startpunkt ist die Ball-Position
-        if ball_name in scene_model.balls:
-            start_x, start_y = scene_model.balls[ball_name].position
-            start_px, start_py = _table_to_pixel_simple((start_x, start_y), image.shape, table_size)
-            points_px.append((start_px, start_py))
+        # Startpunkt ist die Ball-Position, danach die Trajektorienpunkte
+        has_start = ball_name in ball_pixels
+        points_px = np.empty((len(segments) + has_start, 2))
+        if has_start:
+            points_px[0] = ball_pixels[ball_name]
+        points_px[has_start:] = segment_pixels
         
         for idx, segment in enumerate(segments):
+            # Nur die angezeigten Zeilen formatieren, der Rest wird nur gezählt
+            if len(trajectory_info) >= _MAX_INFO_POINTS:
+                break
             tx, ty = segment.point
-            px, py = _table_to_pixel_simple((tx, ty), image.shape, table_size)
-            points_px.append((px, py))
             trajectory_info.append(f"{ball_name}[{idx+1}]: ({tx:.2f}, {ty:.2f}) - {segment.path_type}")
+        trajectory_total += len(segments)
         
-        # Zeichne Trajektorie als Linie
+        # Linie wird gesammelt und unten mit den übrigen als eine LineCollection gezeichnet
         if len(points_px) > 1:
-            xs, ys = zip(*points_px)
-            ax.plot(xs, ys, color=color, linewidth=2, alpha=0.7, zorder=5, label=f"{ball_name} Trajektorie")
+            trajectory_lines.append(points_px)
+            line_colors.append(color)
+            legend_handles.append(Line2D([], [], color=color, linewidth=2, alpha=0.7,
+                                         label=f"{ball_name} Trajektorie"))
             
-            # Zeichne Punkte
-            for i, (px, py) in enumerate(points_px[1:], 1):  # Skip first (ball position)
-                ax.plot(px, py, 'o', color=color, markersize=8, zorder=6)
-                ax.text(px + 10, py, str(i), color=color, fontsize=8, fontweight='bold', 
-                       bbox=dict(boxstyle='round,pad=0.3', facecolor='white', alpha=0.7), zorder=7)
+            # Zeichne Punkte (ohne Ball-Position) als ein Scatter-Artist
+            markers = points_px[1:]
+            ax.scatter(markers[:, 0], markers[:, 1], color=color, s=64, linewidths=1.0, zorder=6)
+            for i, (px, py) in enumerate(markers.tolist(), 1):
+                ax.text(px + 10, py, str(i), color=color, fontproperties=label_font, 
+                       bbox=label_bbox, zorder=7)
+    
+    if trajectory_lines:
+        ax.add_collection(LineCollection(
+            trajectory_lines, colors=line_colors, linewidths=2, alpha=0.7, zorder=5,
+            capstyle='projecting', joinstyle='round',
+        ))
     
     # Zeige Informationen als Text
     info_text = f"Bälle:\n" + "\n".join(ball_info)
     if trajectory_info:
-        info_text += f"\n\nTrajektorien ({len(trajectory_info)} Punkte):\n" + "\n".join(trajectory_info[:15])  # Erste 15
-        if len(trajectory_info) > 15:
-            info_text += f"\n... ({len(trajectory_info) - 15} weitere)"
+        info_text += f"\n\nTrajektorien ({trajectory_total} Punkte):\n" + "\n".join(trajectory_info)
+        if trajectory_total > _MAX_INFO_POINTS:
+            info_text += f"\n... ({trajectory_total - _MAX_INFO_POINTS} weitere)"
     
+    # Unten links im Bild verankert (wächst nach oben), damit der Kasten bei festen Rändern nicht abgeschnitten wird
     ax.text(10, image.shape[0] - 10, info_text, 
             bbox=dict(boxstyle='round', facecolor='white', alpha=0.9),
-            fontsize=8, verticalalignment='top', family='monospace', zorder=20)
+            fontsize=8, verticalalignment='bottom', family='monospace', zorder=20)
     
-    # Legende
-    if scene_model.trajectory and any(scene_model.trajectory.values()):
-        ax.legend(loc='upper right', fontsize=8)
+    # Legende (Stellvertreter-Linien, da die Collection nur ein Label tragen kann)
+    if legend_handles:
+        ax.legend(handles=legend_handles, loc='upper right', fontsize=8)
     
     # Warnung über Näherung
     ax.text(0.5, 0.02, "HINWEIS: Positionen sind Näherungen (ohne Kalibrierungsmatrix)",
             transform=ax.transAxes, ha='center', fontsize=9,
             bbox=dict(boxstyle='round', facecolor='yellow', alpha=0.8), zorder=21)
     
-    plt.tight_layout()
+    # Feste Ränder statt tight_layout/bbox_inches='tight' (die jeweils einen zusätzlichen Render-Durchlauf kosten)
+    fig.subplots_adjust(left=0.06, right=0.98, top=0.97, bottom=0.06)
     
     if output_path:
-        plt.savefig(output_path, dpi=150, bbox_inches='tight')
+        from matplotlib.backends.backend_agg import FigureCanvasAgg
+        FigureCanvasAgg(fig).print_png(str(output_path), pil_kwargs=_PNG_SAVE_KWARGS)
         typer.echo(f"Bild gespeichert: {output_path}")
     else:
         plt.show()
@@ -215,6 +411,32 @@ def _table_to_cm(table_point: Tuple[float, float], table_variant: TableVariant)
     return x_cm, y_cm
 
 
+def _build_diamond_to_cm_matrix(orig_dims: Dict[str, float], dims: Dict[str, float],
+                                use_portrait: bool) -> np.ndarray:
+    """Homogene 3×3-Matrix für YAML-Koordinaten (diamond units) -> Zeichen-Koordinaten (cm).
+    
+    Fasst Skalierung auf orig_dims, proportionale Skalierung auf dims und (Landscape)
+    die Rotation um 90° nach rechts, (x, y) -> (y, width - x), zusammen.
+    """
+    import numpy as np
+    
+    scale_short = orig_dims['width_cm'] / orig_dims['width_units'] * (dims['width_cm'] / orig_dims['width_cm'])
+    scale_long = orig_dims['length_cm'] / orig_dims['length_units'] * (dims['length_cm'] / orig_dims['length_cm'])
+    if use_portrait:
+        # Portrait-Mode: keine Rotation, x entlang kurzer Seite (width), y entlang langer Seite (length)
+        return np.array([
+            [scale_short, 0.0, 0.0],
+            [0.0, scale_long, 0.0],
+            [0.0, 0.0, 1.0],
+        ])
+    # Landscape-Mode: x_new = y_old (lange Seite), y_new = width - x_old (kurze Seite)
+    return np.array([
+        [0.0, scale_long, 0.0],
+        [-scale_short, 0.0, dims['width_cm']],
+        [0.0, 0.0, 1.0],
+    ])
+
+
 def _draw_table_grid(ax, length_cm: float, width_cm: float, 
                      length_units: float, width_units: float,
                      margin_cm: float = 5.0, rotate: bool = False,
@@ -222,6 +444,8 @@ def _draw_table_grid(ax, length_cm: float, width_cm: float,
                      display_length_units: float = None, display_width_units: float = None,
                      orig_length_cm: float = None, orig_width_cm: float = None):
     """Zeichnet das Tischgitter (Banden, Diamantlinien, Cadrelinien)."""
+    import matplotlib.patches as mpatches
+    from matplotlib.collections import LineCollection
     
     # Verwende Display-Dimensionen für Rechteck (falls angegeben, sonst Original)
     if display_length_cm is None:
@@ -243,74 +467,41 @@ def _draw_table_grid(ax, length_cm: float, width_cm: float,
     )
     ax.add_patch(rect)
     
-    # Zeichne Klein-Cadre-Linien - durchgehend, fein
-    # 4 Linien: 2 lange (dritteln in Längsrichtung) und 2 kurze (im Cadreabstand von den kurzen Banden)
-    # CADREABSTAND = 1/3 der Tischbreite (kurze Seite)
-    # Lange Cadrelinien: Dritteln den Tisch in Längsrichtung (3 gleichbreite Streifen)
-    # Kurze Cadrelinien: Im CADREABSTAND von den kurzen Banden
+    # Klein-Cadre-Linien (durchgehend, fein): 2 lange dritteln den Tisch in Längsrichtung,
+    # 2 kurze liegen im CADREABSTAND (1/3 der Tischbreite = kurze Seite) von den kurzen Banden
+    # Diamantlinien (gestrichelt, fein) teilen IMMER in 4×8 Quadrate, unabhängig von der Tischgröße
     if rotate:
         # Portrait-Mode: x ist kurze Seite (width), y ist lange Seite (length)
-        # CADREABSTAND = 1/3 der Tischbreite = 1/3 von x (kurze Seite)
-        cadre_distance_units = display_length_units / 3.0  # x ist kurze Seite
         cadre_distance_cm = display_length_cm / 3.0
-        
-        # Horizontale Cadrelinien (parallel zu x): Dritteln den Tisch (entlang y - lange Seite)
-        # Diese bilden 3 gleichbreite horizontale Streifen
-        for i in [1, 2]:
-            y_pos = (i / 3.0) * display_width_cm  # y ist lange Seite
-            ax.axhline(y_pos, color='darkgray', linewidth=0.8, linestyle='-', zorder=2)
-        
-        # Vertikale Cadrelinien (parallel zu y): Im CADREABSTAND von den kurzen Banden (links/rechts entlang x)
-        # NICHT dritteln! Nur 2 Linien im CADREABSTAND von links und rechts
-        x_left = cadre_distance_cm  # CADREABSTAND von linker Bande (x = 0)
-        x_right = display_length_cm - cadre_distance_cm  # CADREABSTAND von rechter Bande (x = width)
-        ax.axvline(x_left, color='darkgray', linewidth=0.8, linestyle='-', zorder=2)
-        ax.axvline(x_right, color='darkgray', linewidth=0.8, linestyle='-', zorder=2)
+        cadre_xs = [cadre_distance_cm, display_length_cm - cadre_distance_cm]
+        cadre_ys = [(i / 3.0) * display_width_cm for i in (1, 2)]
+        diamond_xs = [(i / 4.0) * display_length_cm for i in range(1, 4)]  # 4 Quadrate → 3 Linien
+        diamond_ys = [(i / 8.0) * display_width_cm for i in range(1, 8)]   # 8 Quadrate → 7 Linien
     else:
         # Landscape-Mode: x ist lange Seite (length), y ist kurze Seite (width)
-        # CADREABSTAND = 1/3 der Tischbreite = 1/3 von y (kurze Seite)
-        cadre_distance_units = display_width_units / 3.0  # y ist kurze Seite
         cadre_distance_cm = display_width_cm / 3.0
-        
-        # Vertikale Cadrelinien (parallel zu y): Im CADREABSTAND von den kurzen Banden (links/rechts entlang x)
-        # NICHT dritteln! Nur 2 Linien im CADREABSTAND von links und rechts
-        x_left = cadre_distance_cm  # CADREABSTAND von linker Bande (x = 0)
-        x_right = display_length_cm - cadre_distance_cm  # CADREABSTAND von rechter Bande (x = length)
-        ax.axvline(x_left, color='darkgray', linewidth=0.8, linestyle='-', zorder=2)
-        ax.axvline(x_right, color='darkgray', linewidth=0.8, linestyle='-', zorder=2)
-        
-        # Horizontale Cadrelinien (parallel zu x): Dritteln den Tisch (entlang y - kurze Seite)
-        # Diese bilden 3 gleichbreite horizontale Streifen
-        for i in [1, 2]:
-            y_pos = (i / 3.0) * display_width_cm  # y ist kurze Seite
-            ax.axhline(y_pos, color='darkgray', linewidth=0.8, linestyle='-', zorder=2)
-    
-    # Zeichne Diamantlinien - gestrichelt, fein
-    # Diamantenlinien teilen IMMER in 4×8 Quadrate, unabhängig von der Tischgröße
-    # Lange Seite: 8 Quadrate → 7 Linien
-    # Kurze Seite: 4 Quadrate → 3 Linien
-    if rotate:
-        # Portrait-Mode: x ist kurze Seite, y ist lange Seite
-        # Vertikale Diamantlinien (parallel zu y, entlang x - kurze Seite): 4 Quadrate → 3 Linien
-        for i in range(1, 4):  # 3 Linien für 4 Quadrate
-            x_pos = (i / 4.0) * display_length_cm
-            ax.axvline(x_pos, color='gray', linewidth=0.5, linestyle='--', zorder=2)
-        
-        # Horizontale Diamantlinien (parallel zu x, entlang y - lange Seite): 8 Quadrate → 7 Linien
-        for i in range(1, 8):  # 7 Linien für 8 Quadrate
-            y_pos = (i / 8.0) * display_width_cm
-            ax.axhline(y_pos, color='gray', linewidth=0.5, linestyle='--', zorder=2)
-    else:
-        # Landscape-Mode: x ist lange Seite, y ist kurze Seite
-        # Vertikale Diamantlinien (parallel zu y, entlang x - lange Seite): 8 Quadrate → 7 Linien
-        for i in range(1, 8):  # 7 Linien für 8 Quadrate
-            x_pos = (i / 8.0) * display_length_cm
-            ax.axvline(x_pos, color='gray', linewidth=0.5, linestyle='--', zorder=2)
-        
-        # Horizontale Diamantlinien (parallel zu x, entlang y - kurze Seite): 4 Quadrate → 3 Linien
-        for i in range(1, 4):  # 3 Linien für 4 Quadrate
-            y_pos = (i / 4.0) * display_width_cm
-            ax.axhline(y_pos, color='gray', linewidth=0.5, linestyle='--', zorder=2)
+        cadre_xs = [cadre_distance_cm, display_length_cm - cadre_distance_cm]
+        cadre_ys = [(i / 3.0) * display_width_cm for i in (1, 2)]
+        diamond_xs = [(i / 8.0) * display_length_cm for i in range(1, 8)]  # 8 Quadrate → 7 Linien
+        diamond_ys = [(i / 4.0) * display_width_cm for i in range(1, 4)]   # 4 Quadrate → 3 Linien
+    
+    # Alle Linien als eine LineCollection, jeweils über den ganzen sichtbaren Bereich (wie axhline/axvline)
+    x_range = (-margin_cm, display_length_cm + margin_cm)
+    y_range = (-margin_cm, display_width_cm + margin_cm)
+    segments, colors, linewidths, linestyles = [], [], [], []
+    for xs, ys, color, linewidth, linestyle in (
+        (cadre_xs, cadre_ys, 'darkgray', 0.8, '-'),
+        (diamond_xs, diamond_ys, 'gray', 0.5, '--'),
+    ):
+        lines = [((x, y_range[0]), (x, y_range[1])) for x in xs]
+        lines += [((x_range[0], y), (x_range[1], y)) for y in ys]
+        segments += lines
+        colors += [color] * len(lines)
+        linewidths += [linewidth] * len(lines)
+        linestyles += [linestyle] * len(lines)
+    ax.add_collection(LineCollection(
+        segments, colors=colors, linewidths=linewidths, linestyles=linestyles, zorder=2,
+    ), autolim=False)
     
     # Setze Achsenbegrenzungen mit Margin
     # Portrait-Mode: x: 0..width (142 cm), y: 0..length (284 cm)
@@ -322,70 +513,52 @@ def _draw_table_grid(ax, length_cm: float, width_cm: float,
     # WICHTIG: y-Achse sollte nicht invertiert werden (Ursprung unten)
 
 
-def _draw_ball(ax, position_cm: Tuple[float, float], ball_name: str):
-    """Zeichnet einen Ball mit korrektem Stil."""
-    x_cm, y_cm = position_cm
-    
-    # Ball-Radius in cm
-    radius_cm = (BALL_DIAMETER_MM / 2) / 10.0
-    
-    # B1 und B2: weiß mit schwarzem Rand
-    # B3: schwarz gefüllt
-    if ball_name == 'B3':
-        facecolor = 'black'
-        edgecolor = 'black'
-        textcolor = 'white'
-    elif ball_name in ['B1', 'B2']:
-        facecolor = 'white'
-        edgecolor = 'black'
-        textcolor = 'black'
-    else:  # Ghost Ball
-        facecolor = 'none'
-        edgecolor = 'gray'
-        textcolor = 'gray'
-    
-    # Zeichne Ball-Kreis
+def _draw_balls(ax, ball_names: List[str], positions_cm: np.ndarray):
+    """Zeichnet alle Bälle (inkl. 'GHOST') als eine EllipseCollection mit korrektem Stil.
+    
+    ``positions_cm`` ist ein (N,2)-Array in der Reihenfolge von ``ball_names``.
+    """
+    from matplotlib.collections import EllipseCollection
+    
+    if not ball_names:
+        return
+    
+    # Ball-Durchmesser in cm
+    diameter_cm = BALL_DIAMETER_MM / 10.0
+    styles = [_DRAW_BALL_STYLES.get(ball_name, _DRAW_GHOST_STYLE) for ball_name in ball_names]
+    facecolors, edgecolors, textcolors = zip(*styles)
+    
     # Linienstärke: 1.0 Pixel für bessere Beurteilung der Daten
-    if ball_name == 'GHOST':
-        circle = mpatches.Circle(
-            (x_cm, y_cm), radius_cm,
-            facecolor=facecolor, edgecolor=edgecolor, linewidth=1.0,
-            linestyle='--', zorder=10
-        )
-    else:
-        circle = mpatches.Circle(
-            (x_cm, y_cm), radius_cm,
-            facecolor=facecolor, edgecolor=edgecolor, linewidth=1.0,
-            zorder=10
-        )
-    ax.add_patch(circle)
-    
-    # Zeichne Label - zentriert auf dem Ball, Text bleibt immer aufrecht
-    ax.text(x_cm, y_cm, ball_name, ha='center', va='center',
-            fontsize=10, fontweight='bold', color=textcolor, zorder=11, rotation=0)
-
-
-def _draw_trajectory(ax, trajectory_points_cm: List[Tuple[float, float]], 
-                     ball_name: str, start_position_cm: Tuple[float, float]):
-    """Zeichnet eine Trajektorie."""
-    trajectory_colors = {
-        'B1': 'red',
-        'B2': 'blue',
-        'B3': 'green',
-    }
-    color = trajectory_colors.get(ball_name, 'orange')
-    
-    # Verbinde alle Punkte
-    all_points = [start_position_cm] + trajectory_points_cm
-    if len(all_points) < 2:
+    ax.add_collection(EllipseCollection(
+        diameter_cm, diameter_cm, 0.0, units='xy',
+        offsets=positions_cm, offset_transform=ax.transData,
+        facecolors=facecolors, edgecolors=edgecolors, linewidths=1.0,
+        linestyles=['--' if ball_name == 'GHOST' else '-' for ball_name in ball_names], zorder=10,
+    ))
+    
+    # Zeichne Labels - zentriert auf dem Ball, Text bleibt immer aufrecht
+    for ball_name, (x_cm, y_cm), textcolor in zip(ball_names, positions_cm.tolist(), textcolors):
+        ax.text(x_cm, y_cm, ball_name, ha='center', va='center',
+                fontsize=10, fontweight='bold', color=textcolor, zorder=11, rotation=0)
+
+
+def _draw_trajectories(ax, trajectories_cm: Dict[str, np.ndarray]):
+    """Zeichnet alle Trajektorien; je Ball ein (N,2)-Array aus Startposition und Trajektorienpunkten."""
+    from matplotlib.collections import LineCollection
+    
+    if not trajectories_cm:
         return
+    colors = [_TRAJECTORY_COLORS.get(ball_name, 'orange') for ball_name in trajectories_cm]
     
-    xs, ys = zip(*all_points)
-    ax.plot(xs, ys, color=color, linewidth=2, alpha=0.7, zorder=5)
+    # Alle Linienzüge in einem Artist (Cap-/Join-Style wie bei Line2D)
+    ax.add_collection(LineCollection(
+        list(trajectories_cm.values()), colors=colors, linewidths=2, alpha=0.7, zorder=5,
+        capstyle='projecting', joinstyle='round',
+    ))
     
-    # Zeichne Punkte
-    for i, (x, y) in enumerate(trajectory_points_cm, 1):
-        ax.plot(x, y, 'o', color=color, markersize=6, zorder=6)
+    # Zeichne Punkte (ohne Startposition) je Ball als ein Scatter-Artist (s=36 entspricht markersize=6)
+    for points_cm, color in zip(trajectories_cm.values(), colors):
+        ax.scatter(points_cm[1:, 0], points_cm[1:, 1], color=color, s=36, linewidths=1.0, zorder=6)
 
 
 @app.command()
@@ -395,7 +568,9 @@ def draw(
     portrait: bool = typer.Option(False, "--portrait", help="Portrait-Mode: x=kurze Seite (0..40), y=lange Seite (0..80)"),
     landscape: bool = typer.Option(True, "--landscape/--no-landscape", help="Landscape-Mode (Default): x=lange Seite (0..80), y=kurze Seite (0..40), 90° nach rechts gedreht"),
     output_path: Optional[Path] = typer.Option(None, "--output", "-o", help="Ausgabepfad für das Bild (optional)"),
-    dpi: int = typer.Option(150, "--dpi", help="Auflösung für gespeichertes Bild"),
+    dpi: int = typer.Option(96, "--dpi", help="Auflösung für gespeichertes Bild"),
+    high_dpi: bool = typer.Option(False, "--high-dpi", help=f"Mit {HIGH_DPI} dpi speichern (frühere Voreinstellung, überschreibt --dpi)"),
+    force: bool = typer.Option(False, "--force", help="Bild auch dann neu zeichnen, wenn es neuer als die YAML ist"),
 ) -> None:
     """Zeichnet eine Szenen-YAML auf einem sauberen Canvas mit Gitter.
     
@@ -411,6 +586,11 @@ def draw(
     - y-Achse: vertikal, lange Bande (0..80 diamond units = 284 cm)
     """
     
+    if _output_is_current(output_path, yaml_path, force):
+        return
+    
+    plt = _pyplot(headless=output_path is not None)
+    
     # Bestimme Modus: Wenn --portrait gesetzt, verwende Portrait, sonst Landscape
     use_portrait = portrait
     
@@ -434,82 +614,40 @@ def draw(
         display_width_cm = dims['length_cm']   # y: 0..284 (lange Seite vertikal)
         display_length_units = dims['width_units']  # 40 (x-Achse)
         display_width_units = dims['length_units']  # 80 (y-Achse)
-        fig, ax = plt.subplots(figsize=(10, 14))  # Portrait: höher als breit
+        fig, ax = plt.subplots(figsize=(10, 14), layout='constrained')  # Portrait: höher als breit
     else:
         # Landscape-Mode: x entlang length (lange Seite), y entlang width (kurze Seite)
         display_length_cm = dims['length_cm']  # x: 0..284 (lange Seite horizontal)
         display_width_cm = dims['width_cm']    # y: 0..142 (kurze Seite vertikal)
         display_length_units = dims['length_units']  # 80 (x-Achse)
         display_width_units = dims['width_units']    # 40 (y-Achse)
-        fig, ax = plt.subplots(figsize=(14, 10))  # Landscape: breiter als hoch
+        fig, ax = plt.subplots(figsize=(14, 10), layout='constrained')  # Landscape: breiter als hoch
     
-    # Transformiere Positionen von diamond units zu cm
-    # YAML-Koordinaten: (x, y) wobei x entlang kurzer Seite (0..40), y entlang langer Seite (0..80)
-    balls_cm = {}
-    for ball_name, ball_data in scene_model.balls.items():
-        x_diamond, y_diamond = ball_data.position
-        
-        if use_portrait:
-            # Portrait-Mode: x entlang kurzer Seite (width), y entlang langer Seite (length)
-            # Keine Transformation nötig, aber proportionale Skalierung erforderlich
-            # Schritt 1: Skaliere auf Original-Dimensionen (bezogen auf orig_dims)
-            x_cm_orig = (x_diamond / orig_dims['width_units']) * orig_dims['width_cm']  # x entlang kurzer Seite
-            y_cm_orig = (y_diamond / orig_dims['length_units']) * orig_dims['length_cm']  # y entlang langer Seite
-            
-            # Schritt 2: Skaliere proportional auf Ziel-Dimensionen
-            scale_factor_width = dims['width_cm'] / orig_dims['width_cm']  # Skalierungsfaktor für kurze Seite
-            scale_factor_length = dims['length_cm'] / orig_dims['length_cm']  # Skalierungsfaktor für lange Seite
-            x_cm_final = x_cm_orig * scale_factor_width  # x entlang kurzer Seite
-            y_cm_final = y_cm_orig * scale_factor_length  # y entlang langer Seite
-        else:
-            # Landscape-Mode: Um 90° nach rechts gedreht
-            # WICHTIG: Für proportionale Positionen müssen wir zuerst auf Original-Dimensionen skalieren,
-            # dann transformieren, dann proportional auf Ziel-Dimensionen skalieren
-            # Oder einfacher: Verwende orig_dims für Skalierung, dann transformiere, dann skaliere proportional
-            
-            # Schritt 1: Skaliere auf Original-Dimensionen (bezogen auf orig_dims)
-            x_cm_orig = (x_diamond / orig_dims['width_units']) * orig_dims['width_cm']  # x entlang kurzer Seite
-            y_cm_orig = (y_diamond / orig_dims['length_units']) * orig_dims['length_cm']  # y entlang langer Seite
-            
-            # Schritt 2: Transformiere (Rotation um 90° nach rechts)
-            # (x_new, y_new) = (y_old, width - x_old)
-            x_transformed = y_cm_orig  # y wird zu x (lange Seite)
-            y_transformed = orig_dims['width_cm'] - x_cm_orig  # width - x wird zu y (kurze Seite)
-            
-            # Schritt 3: Skaliere proportional auf Ziel-Dimensionen
-            scale_factor_length = dims['length_cm'] / orig_dims['length_cm']  # Skalierungsfaktor für lange Seite
-            scale_factor_width = dims['width_cm'] / orig_dims['width_cm']  # Skalierungsfaktor für kurze Seite
-            x_cm_final = x_transformed * scale_factor_length  # x entlang langer Seite
-            y_cm_final = y_transformed * scale_factor_width  # y entlang kurzer Seite
-        
-        balls_cm[ball_name] = (x_cm_final, y_cm_final)
+    import numpy as np
     
-    # Transformiere Ghost Ball
-    ghost_ball_cm = None
+    # Alle Positionen (Bälle, Ghost Ball, Trajektorien) sammeln und in einem Schritt von diamond units zu cm transformieren
+    # YAML-Koordinaten: (x, y) wobei x entlang kurzer Seite (0..40), y entlang langer Seite (0..80)
+    ball_names = list(scene_model.balls)
+    diamond_points = [scene_model.balls[name].position for name in ball_names]
+    ghost_index = None
     if scene_model.ghost_ball:
-        gx_diamond, gy_diamond = scene_model.ghost_ball.position
-        
-        if use_portrait:
-            # Portrait-Mode: proportionale Skalierung
-            gx_cm_orig = (gx_diamond / orig_dims['width_units']) * orig_dims['width_cm']
-            gy_cm_orig = (gy_diamond / orig_dims['length_units']) * orig_dims['length_cm']
-            scale_factor_width = dims['width_cm'] / orig_dims['width_cm']
-            scale_factor_length = dims['length_cm'] / orig_dims['length_cm']
-            gx_cm_final = gx_cm_orig * scale_factor_width
-            gy_cm_final = gy_cm_orig * scale_factor_length
-        else:
-            # Landscape-Mode: Um 90° nach rechts gedreht
-            # Wie bei normalen Bällen: Skaliere auf Original, transformiere, skaliere proportional
-            gx_cm_orig = (gx_diamond / orig_dims['width_units']) * orig_dims['width_cm']
-            gy_cm_orig = (gy_diamond / orig_dims['length_units']) * orig_dims['length_cm']
-            gx_transformed = gy_cm_orig
-            gy_transformed = orig_dims['width_cm'] - gx_cm_orig
-            scale_factor_length = dims['length_cm'] / orig_dims['length_cm']
-            scale_factor_width = dims['width_cm'] / orig_dims['width_cm']
-            gx_cm_final = gx_transformed * scale_factor_length
-            gy_cm_final = gy_transformed * scale_factor_width
-        
-        ghost_ball_cm = (gx_cm_final, gy_cm_final)
+        ghost_index = len(diamond_points)
+        diamond_points.append(scene_model.ghost_ball.position)
+    segment_ranges: Dict[str, slice] = {}
+    for ball_name, segments in scene_model.trajectory.items():
+        if not segments or ball_name not in scene_model.balls:
+            continue
+        segment_ranges[ball_name] = slice(len(diamond_points), len(diamond_points) + len(segments))
+        diamond_points.extend(segment.point for segment in segments)
+    diamond_points = np.asarray(diamond_points, dtype=np.float64).reshape(-1, 2)
+    
+    # Affine Abbildung ohne homogene Division: 2×2-Anteil plus Translation
+    transform = _build_diamond_to_cm_matrix(orig_dims, dims, use_portrait)
+    points_cm = diamond_points @ transform[:2, :2].T + transform[:2, 2]
+    
+    # Bälle und Ghost Ball liegen vorne im Array: Namen und Positionen parallel (kein Dict von Tupeln)
+    drawn_names = ball_names + (['GHOST'] if ghost_index is not None else [])
+    ball_index = {name: i for i, name in enumerate(ball_names)}
     
     # Zeichne Gitter
     _draw_table_grid(ax, display_length_cm, display_width_cm, 
@@ -519,47 +657,13 @@ def draw(
                      orig_length_cm=dims['length_cm'], orig_width_cm=dims['width_cm'])
     
     # Zeichne Trajektorien (vor den Bällen, damit sie darunter liegen)
-    for ball_name, segments in scene_model.trajectory.items():
-        if not segments or ball_name not in balls_cm:
-            continue
-        
-        start_pos = balls_cm[ball_name]
-        trajectory_points_cm = []
-        
-        for segment in segments:
-            tx_diamond, ty_diamond = segment.point
-            
-            if use_portrait:
-                # Portrait-Mode: proportionale Skalierung
-                tx_cm_orig = (tx_diamond / orig_dims['width_units']) * orig_dims['width_cm']
-                ty_cm_orig = (ty_diamond / orig_dims['length_units']) * orig_dims['length_cm']
-                scale_factor_width = dims['width_cm'] / orig_dims['width_cm']
-                scale_factor_length = dims['length_cm'] / orig_dims['length_cm']
-                tx_cm_final = tx_cm_orig * scale_factor_width
-                ty_cm_final = ty_cm_orig * scale_factor_length
-            else:
-                # Landscape-Mode: Um 90° nach rechts gedreht
-                # Wie bei normalen Bällen: Skaliere auf Original, transformiere, skaliere proportional
-                tx_cm_orig = (tx_diamond / orig_dims['width_units']) * orig_dims['width_cm']
-                ty_cm_orig = (ty_diamond / orig_dims['length_units']) * orig_dims['length_cm']
-                tx_transformed = ty_cm_orig
-                ty_transformed = orig_dims['width_cm'] - tx_cm_orig
-                scale_factor_length = dims['length_cm'] / orig_dims['length_cm']
-                scale_factor_width = dims['width_cm'] / orig_dims['width_cm']
-                tx_cm_final = tx_transformed * scale_factor_length
-                ty_cm_final = ty_transformed * scale_factor_width
-            
-            trajectory_points_cm.append((tx_cm_final, ty_cm_final))
-        
-        _draw_trajectory(ax, trajectory_points_cm, ball_name, start_pos)
-    
-    # Zeichne Bälle
-    for ball_name, position_cm in balls_cm.items():
-        _draw_ball(ax, position_cm, ball_name)
+    _draw_trajectories(ax, {
+        ball_name: np.vstack((points_cm[ball_index[ball_name]], points_cm[segment_range]))
+        for ball_name, segment_range in segment_ranges.items()
+    })
     
-    # Zeichne Ghost Ball
-    if ghost_ball_cm:
-        _draw_ball(ax, ghost_ball_cm, 'GHOST')
+    # Zeichne Bälle und Ghost Ball (zuletzt, wie bisher)
+    _draw_balls(ax, drawn_names, points_cm[:len(drawn_names)])
     
     # Titel und Labels
     table_name = "Match-Tisch" if table_var == TableVariant.MATCH else "Turnier-Tisch"
@@ -577,10 +681,12 @@ def draw(
         ax.set_ylabel(f"y (diamond units: 0..{int(display_width_units)}, kurze Seite)", fontsize=10)
     ax.set_title(title, fontsize=12, fontweight='bold', pad=20)
     
-    plt.tight_layout()
-    
     if output_path:
-        plt.savefig(output_path, dpi=dpi, bbox_inches='tight')
+        # Direkt über die Agg-Canvas speichern; ohne bbox_inches='tight' (zweiter Render-Durchlauf),
+        # die Ränder setzt constrained_layout beim Zeichnen
+        from matplotlib.backends.backend_agg import FigureCanvasAgg
+        fig.set_dpi(HIGH_DPI if high_dpi else dpi)
+        FigureCanvasAgg(fig).print_png(str(output_path), pil_kwargs=_PNG_SAVE_KWARGS)
         typer.echo(f"Bild gespeichert: {output_path}")
     else:
         plt.show()
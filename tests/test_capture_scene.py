@@ -0,0 +1,24 @@
+from __future__ import annotations
+
+import numpy as np
+import pytest
+
+cv2 = pytest.importorskip("cv2")
+
+from src.tools.capture_scene import _render_digit_template
+
+
+@pytest.mark.parametrize("digit", range(10))
+def test_inverted_digit_template_matches_negated(digit: int) -> None:
+    template = _render_digit_template(digit, False)
+    inverted = _render_digit_template(digit, True)
+    np.testing.assert_allclose(inverted, 1.0 - template, atol=1e-5)
+
+    # _refine_with_digit matcht nur das normale Template und wertet -Minimum als invertierten Treffer
+    rng = np.random.default_rng(digit)
+    patch = rng.random((80, 80), dtype=np.float32)
+    patch[10:58, 20:68] = inverted
+    normal_result = cv2.matchTemplate(patch, template, cv2.TM_CCOEFF_NORMED)
+    inverted_result = cv2.matchTemplate(patch, inverted, cv2.TM_CCOEFF_NORMED)
+    np.testing.assert_allclose(inverted_result, -normal_result, atol=1e-4)
+    assert np.unravel_index(normal_result.argmin(), normal_result.shape) == (10, 20)
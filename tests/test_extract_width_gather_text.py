@@ -0,0 +1,19 @@
+from __future__ import annotations
+
+import pytest
+
+from scripts.extract_width_gather_text import extract_scene_info
+
+
+@pytest.mark.parametrize(
+    ("raw_title", "expected"),
+    [
+        ("DIRECT POINT - GATHER SHOT BY ONE BAND", "DIRECT POINT – GATHER SHOT BY ONE BAND"),
+        ("DIRECT POINT-GATHER SHOT BY ONE-BAND", "DIRECT POINT – GATHER SHOT BY ONE – BAND"),
+        ("DIRECT POINT -GATHER\nSHOT", "DIRECT POINT – GATHER SHOT"),
+        ("DIRECT POINT--GATHER", "DIRECT POINT – – GATHER"),
+    ],
+)
+def test_title_dashes_are_normalized(raw_title: str, expected: str) -> None:
+    info = extract_scene_info(f"2.1. {raw_title}\nQuantité de bille: 1/2\n")
+    assert info["title"] == f"2.1. {expected}"
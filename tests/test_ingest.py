@@ -0,0 +1,152 @@
+from __future__ import annotations
+
+import json
+import os
+import shutil
+from datetime import datetime, timezone
+from pathlib import Path
+
+import pytest
+import yaml
+from sqlalchemy import create_engine, event, func, select
+from sqlalchemy.orm import Session
+
+try:
+    from yaml import CSafeLoader as _SafeLoader
+except ImportError:  # pragma: no cover
+    from yaml import SafeLoader as _SafeLoader
+
+from src.db import models
+from src.services.ingest import (
+    COPY_THRESHOLD,
+    _replace_todo,
+    _scene_cache_path,
+    import_scenes,
+    load_scene_yaml,
+)
+
+
+def test_replace_todo_only_replaces_whole_placeholders() -> None:
+    raw = (
+        b"a: TODO\n"
+        b"b: 'todo'  # offen\n"
+        b"c: TODO \xe2\x80\x93 erg\xc3\xa4nzen\n"
+        b"d:\n  - TODO\n  - key: TODO\n"
+        b"e: [TODO, 1.5]\n"
+        b"f: 'TODO: Szene beschreiben'\n"
+        b"g: |\n  Hinweis: TODO\n  - TODO\n"
+        b"h: >\n  key: TODO\n"
+        b"i:\n  TODO\n"
+    )
+    data = _replace_todo(yaml.load(raw, Loader=_SafeLoader))
+    assert data == {
+        "a": 0.0,
+        "b": 0.0,
+        "c": "TODO – ergänzen",
+        "d": [0.0, {"key": 0.0}],
+        "e": [0.0, 1.5],
+        "f": "TODO: Szene beschreiben",
+        "g": "Hinweis: TODO\n- TODO\n",
+        "h": "key: TODO\n",
+        "i": 0.0,
+    }
+
+
+def test_scene_cache_round_trip_and_fingerprint(tmp_path: Path) -> None:
+    source = Path("data/annotations/gretillat/VS-Lang-02-01.yaml")
+    path = tmp_path / source.name
+    shutil.copyfile(source, path)
+
+    scene = load_scene_yaml(path)
+    cache_path = _scene_cache_path(path)
+    assert cache_path.exists()
+    assert load_scene_yaml(path) == scene
+
+    # Fremder Fingerabdruck (z.B. nach Schemaänderung): Cache wird verworfen und neu geschrieben
+    cached = json.loads(cache_path.read_text(encoding="utf-8"))
+    cached["fingerprint"] = "veraltet"
+    cached["scene"]["title"] = "aus dem Cache"
+    cache_path.write_text(json.dumps(cached), encoding="utf-8")
+    assert load_scene_yaml(path).title == scene.title
+    assert json.loads(cache_path.read_text(encoding="utf-8"))["fingerprint"] != "veraltet"
+
+    # Durch eine ältere Kopie ersetzt (wie cp -p / rsync -t): Inhalt zählt, nicht die mtime
+    cache_mtime_ns = cache_path.stat().st_mtime_ns
+    shutil.copyfile(Path("data/annotations/gretillat/VS-Lang-02-02.yaml"), path)
+    os.utime(path, ns=(cache_mtime_ns - 10**9, cache_mtime_ns - 10**9))
+    assert load_scene_yaml(path).id == "VS-Lang-02-02"
+
+
+# Runde gegen PostgreSQL (inkl. COPY-Pfad in _bulk_insert) nur mit eigener Test-Datenbank
+_POSTGRES_TEST_URL = os.getenv("BTRAINER_TEST_POSTGRES_URL")
+
+
+@pytest.fixture(params=["sqlite", "postgresql"])
+def db_engine(request: pytest.FixtureRequest, tmp_path: Path):
+    if request.param == "sqlite":
+        engine = create_engine(f"sqlite:///{tmp_path / 'ingest.db'}")
+        # server_default now() der Zeitstempel-Spalten
+        event.listen(
+            engine,
+            "connect",
+            lambda connection, _: connection.create_function(
+                "now", 0, lambda: datetime.now(timezone.utc).isoformat(" ")
+            ),
+        )
+    elif _POSTGRES_TEST_URL:
+        engine = create_engine(_POSTGRES_TEST_URL)
+    else:
+        pytest.skip("BTRAINER_TEST_POSTGRES_URL nicht gesetzt (COPY-Pfad nur unter PostgreSQL/psycopg)")
+    models.Base.metadata.create_all(engine)
+    yield engine
+    models.Base.metadata.drop_all(engine)
+    engine.dispose()
+
+
+def _row_counts(session: Session) -> dict[str, int]:
+    return {
+        table.name: session.scalar(select(func.count()).select_from(table))
+        for table in models.Base.metadata.sorted_tables
+    }
+
+
+def test_import_scenes_round_trip(db_engine, tmp_path: Path) -> None:
+    # Genug Szenen, damit die Bälle (>= COPY_THRESHOLD Zeilen) unter PostgreSQL per COPY geschrieben werden
+    sources = sorted(Path("data/annotations/gretillat").glob("VS-Lang-*.yaml"))[:30]
+    paths = []
+    for source in sources:
+        shutil.copyfile(source, tmp_path / source.name)
+        paths.append(tmp_path / source.name)
+
+    with Session(db_engine) as session:
+        first_ids = import_scenes(session, paths)
+        session.commit()
+        counts = _row_counts(session)
+        assert counts["scene"] == len(paths)
+        assert counts["ball_position"] >= COPY_THRESHOLD
+
+        # Zweiter Import derselben Dateien: gleiche IDs, keine zusätzlichen Zeilen
+        assert import_scenes(session, paths) == first_ids
+        session.commit()
+        assert _row_counts(session) == counts
+
+        # Geänderte Szene: Spalten und Kind-Zeilen werden aktualisiert, nicht verdoppelt
+        changed = paths[0]
+        data = yaml.load(changed.read_bytes(), Loader=_SafeLoader)
+        data["scene"]["title"] = "Neuer Titel"
+        ball_name = next(iter(data["scene"]["balls"]))
+        data["scene"]["balls"][ball_name]["position"] = [1.5, 2.5]
+        changed.write_text(yaml.safe_dump(data, allow_unicode=True), encoding="utf-8")
+
+        assert import_scenes(session, [changed]) == first_ids[:1]
+        session.commit()
+        assert _row_counts(session) == counts
+        scene = session.get(models.Scene, first_ids[0])
+        assert scene.title == "Neuer Titel"
+        ball = session.scalars(
+            select(models.BallPosition).where(
+                models.BallPosition.scene_id == first_ids[0],
+                models.BallPosition.ball_name == ball_name,
+            )
+        ).one()
+        assert (ball.x, ball.y) == (1.5, 2.5)
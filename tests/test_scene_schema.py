@@ -6,6 +6,11 @@ from typing import Any
 
 import yaml
 
+try:
+    from yaml import CSafeLoader as _SafeLoader
+except ImportError:  # pragma: no cover
+    from yaml import SafeLoader as _SafeLoader
+
 from src.db.schemas import SceneModel
 
 
@@ -21,7 +26,7 @@ def _replace_todo(value: Any) -> Any:
 
 def test_yaml_scene_loads() -> None:
     path = Path("data/annotations/gretillat/VS-Lang-02-01.yaml")
-    raw = yaml.safe_load(path.read_text())
+    raw = yaml.load(path.read_bytes(), Loader=_SafeLoader)
     cleaned = _replace_todo(raw["scene"])
     data = SceneModel.model_validate(cleaned)
     assert data.id == "VS-Lang-02-01"
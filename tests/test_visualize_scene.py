@@ -0,0 +1,26 @@
+from __future__ import annotations
+
+from pathlib import Path
+
+import yaml
+
+try:
+    from yaml import CSafeLoader as _SafeLoader
+except ImportError:  # pragma: no cover
+    from yaml import SafeLoader as _SafeLoader
+
+from src.tools.visualize_scene import visualize
+
+
+def test_visualize_scene_without_balls(tmp_path: Path) -> None:
+    raw = yaml.load(Path("data/annotations/gretillat/VS-Lang-02-01.yaml").read_bytes(), Loader=_SafeLoader)
+    raw["scene"]["balls"] = {}
+    raw["scene"].pop("ghost_ball", None)
+    raw["scene"]["trajectory"] = {}
+    yaml_path = tmp_path / "VS-Lang-02-01.yaml"
+    yaml_path.write_text(yaml.safe_dump(raw, allow_unicode=True), encoding="utf-8")
+    output_path = tmp_path / "scene.png"
+
+    visualize(yaml_path, output_path=output_path, validate_only=False, force=True)
+
+    assert output_path.stat().st_size > 0